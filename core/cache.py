@@ -0,0 +1,184 @@
+"""
+Redis client, shared login-session store and JSON response cache
+"""
+
+import json
+import secrets
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+import structlog
+
+from core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Redis is optional: without the package or REDIS_URL we fall back to
+# process-local storage, which is only correct for a single worker
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+redis_client = None
+if aioredis is not None and settings.REDIS_URL:
+    try:
+        redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        logger.info("Redis client initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize Redis client: {str(e)}")
+        redis_client = None
+else:
+    logger.warning("Redis not configured, using in-process session store")
+
+if redis_client is None and settings.WORKERS > 1:
+    raise RuntimeError(
+        f"REDIS_URL is required with WORKERS={settings.WORKERS}: the in-process "
+        "session store is not shared between workers"
+    )
+
+_SESSION_KEY = "sess:{}"
+_COOKIE_SESSION_KEY = "sid:{}"
+
+# user_id -> (session_id, expires_at) when Redis is unavailable
+_local_sessions: Dict[int, Tuple[int, float]] = {}
+
+def _session_ttl() -> int:
+    """Login sessions live as long as the access token"""
+    return settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+async def save_login_session(user_id: int, session_id: int) -> None:
+    """Remember the open UserSession row for a logged-in user"""
+    if redis_client is not None:
+        key = _SESSION_KEY.format(user_id)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={"session_id": session_id})
+            pipe.expire(key, _session_ttl())
+            await pipe.execute()
+        return
+
+    _local_sessions[user_id] = (session_id, time.monotonic() + _session_ttl())
+
+async def pop_login_session(user_id: int, sid: Optional[str] = None) -> Optional[int]:
+    """Forget and return the open UserSession id for a user, if any
+    
+    When sid is given the matching cookie session is dropped in the same
+    transaction, so logout never leaves one half cleared.
+    """
+    if redis_client is not None:
+        key = _SESSION_KEY.format(user_id)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hget(key, "session_id")
+            pipe.delete(key)
+            if sid:
+                pipe.delete(_COOKIE_SESSION_KEY.format(sid))
+            session_id = (await pipe.execute())[0]
+        return int(session_id) if session_id else None
+
+    if sid:
+        _local_cookie_sessions.pop(sid, None)
+    entry = _local_sessions.pop(user_id, None)
+    if entry is None:
+        return None
+    session_id, expires_at = entry
+    return session_id if expires_at > time.monotonic() else None
+
+# Opaque browser sessions: the cookie carries a random id, the identity
+# lives server-side under sid:<id> for the lifetime of the access token
+# sid -> (identity, expires_at) when Redis is unavailable
+_local_cookie_sessions: Dict[str, Tuple[Dict[str, Any], float]] = {}
+
+async def create_cookie_session(identity: Dict[str, Any]) -> str:
+    """Store identity under a new random session id and return the id"""
+    sid = secrets.token_urlsafe(32)
+    if redis_client is not None:
+        await redis_client.set(
+            _COOKIE_SESSION_KEY.format(sid), json.dumps(identity), ex=_session_ttl()
+        )
+    else:
+        _local_cookie_sessions[sid] = (identity, time.monotonic() + _session_ttl())
+    return sid
+
+async def get_cookie_session(sid: str) -> Optional[Dict[str, Any]]:
+    """Look up the identity behind a session id, if it is still valid"""
+    if redis_client is not None:
+        raw = await redis_client.get(_COOKIE_SESSION_KEY.format(sid))
+        return json.loads(raw) if raw is not None else None
+
+    entry = _local_cookie_sessions.get(sid)
+    if entry is None:
+        return None
+    identity, expires_at = entry
+    if expires_at <= time.monotonic():
+        _local_cookie_sessions.pop(sid, None)
+        return None
+    return identity
+
+async def delete_cookie_session(sid: str) -> None:
+    """Invalidate a session id"""
+    if redis_client is not None:
+        await redis_client.delete(_COOKIE_SESSION_KEY.format(sid))
+    else:
+        _local_cookie_sessions.pop(sid, None)
+
+# Fixed-window counters for throttling; key -> (count, window_ends_at)
+# when Redis is unavailable
+_local_counters: Dict[str, Tuple[int, float]] = {}
+
+async def hit_rate_limit(key: str, limit: int, window: int) -> bool:
+    """Count one attempt against key; True once more than limit fall in the window"""
+    if redis_client is not None:
+        try:
+            # Start the window and count in one transaction so a crash
+            # between the two can never leave a counter without a TTL
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.set(key, 0, ex=window, nx=True)
+                pipe.incr(key)
+                _, count = await pipe.execute()
+            return count > limit
+        except Exception as e:
+            # Fail open: a Redis outage must not lock everyone out
+            logger.error(f"Redis rate limit check failed for {key}: {str(e)}")
+            return False
+
+    now = time.monotonic()
+    if len(_local_counters) > 10_000:
+        for stale in [k for k, (_, ends) in _local_counters.items() if ends <= now]:
+            del _local_counters[stale]
+    count, window_ends_at = _local_counters.get(key, (0, now + window))
+    if window_ends_at <= now:
+        count, window_ends_at = 0, now + window
+    _local_counters[key] = (count + 1, window_ends_at)
+    return count + 1 > limit
+
+# Read-through cache of serialized JSON bodies; a no-op without Redis so
+# workers never serve data another worker has already invalidated
+async def cache_get_raw(key: str) -> Optional[str]:
+    """Return the cached JSON body for key, or None on a miss"""
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(key)
+    except Exception as e:
+        logger.error(f"Redis GET failed for {key}: {str(e)}")
+        return None
+
+async def cache_set_raw(key: str, body: Union[str, bytes], ttl: int) -> None:
+    """Store an already-serialized JSON body under key for ttl seconds"""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.set(key, body, ex=ttl)
+    except Exception as e:
+        logger.error(f"Redis SET failed for {key}: {str(e)}")
+
+async def cache_delete(*patterns: str) -> None:
+    """Delete cached keys; patterns may use Redis glob syntax"""
+    if redis_client is None:
+        return
+    try:
+        for pattern in patterns:
+            keys = [key async for key in redis_client.scan_iter(match=pattern)]
+            if keys:
+                await redis_client.delete(*keys)
+    except Exception as e:
+        logger.error(f"Redis cache invalidation failed: {str(e)}")
@@ -44,6 +44,17 @@ class Settings(BaseSettings):
     # Session
     SESSION_TIMEOUT_MINUTES: int = 60
     
+    # Login throttling (attempts per client IP + username per window)
+    LOGIN_RATE_LIMIT: int = 10
+    LOGIN_RATE_WINDOW_SECONDS: int = 60
+    
+    # Redis (shared session store / cache)
+    REDIS_URL: Optional[str] = None
+    
+    # Uvicorn worker count (same variable the launch command reads); more
+    # than one needs REDIS_URL so every worker sees the same sessions
+    WORKERS: int = 1
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
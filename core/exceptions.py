@@ -2,8 +2,10 @@
 Custom exception classes and handlers
 """
 
+from functools import wraps
+from html import escape
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 import structlog
@@ -74,6 +76,19 @@ async def general_exception_handler(request: Request, exc: Exception):
         content={"detail": "Internal server error"}
     )
 
+_HTMX_ERROR = '<div class="alert alert-danger">{}</div>'
+
+def htmx_safe(endpoint):
+    """Render any exception raised by an HTMX endpoint as an alert fragment"""
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"HTMX endpoint error: {str(e)}", endpoint=endpoint.__name__)
+            return HTMLResponse(_HTMX_ERROR.format(escape(str(e))))
+    return wrapper
+
 def add_exception_handlers(app: FastAPI):
     """Add all exception handlers to FastAPI app"""
     app.add_exception_handler(AppException, app_exception_handler)
@@ -2,12 +2,18 @@
 Security utilities for Bite Me Buddy
 """
 
+import asyncio
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from itsdangerous import BadSignature, URLSafeTimedSerializer
 from fastapi import HTTPException, status, Request
+import hashlib
 import secrets
+import threading
+import time
 
 from core.config import settings
 
@@ -22,6 +28,15 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+# bcrypt is deliberately slow; run it off the event loop in request handlers
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in a worker thread"""
+    return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in a worker thread"""
+    return await asyncio.to_thread(pwd_context.hash, password)
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -43,6 +58,64 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
     except JWTError:
         return None
 
+# Decoded payloads of recently verified tokens, keyed by a short token digest
+_TOKEN_CACHE_SIZE = 10_000
+_TOKEN_CACHE_TTL = 60  # seconds
+_token_cache: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def verify_token_cached(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a JWT token, reusing the decoded payload for repeat requests
+    
+    A cache hit skips the signature check and only re-checks ``exp``.
+    """
+    key = _token_key(token)
+    now = time.time()
+    
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is not None:
+            payload, cached_until = entry
+            if now < cached_until and payload.get("exp", 0) > now:
+                _token_cache.move_to_end(key)
+                return payload
+            del _token_cache[key]
+    
+    payload = verify_token(token)
+    if payload is None:
+        return None
+    
+    with _token_cache_lock:
+        _token_cache[key] = (payload, now + _TOKEN_CACHE_TTL)
+        if len(_token_cache) > _TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return payload
+
+def forget_token(token: str) -> None:
+    """Drop a token from the verification cache (e.g. on logout)"""
+    with _token_cache_lock:
+        _token_cache.pop(_token_key(token), None)
+
+# Session-id cookies are HMAC-SHA256 signed so forged ids are rejected
+# locally, without a session-store round trip
+_sid_signer = URLSafeTimedSerializer(
+    settings.SECRET_KEY, salt="sid", signer_kwargs={"digest_method": hashlib.sha256}
+)
+
+def sign_session_id(sid: str) -> str:
+    """Sign a session id for use as a cookie value"""
+    return _sid_signer.dumps(sid)
+
+def unsign_session_id(cookie: str) -> Optional[str]:
+    """Return the session id from a signed cookie, or None if invalid or expired"""
+    try:
+        return _sid_signer.loads(cookie, max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+    except BadSignature:
+        return None
+
 def generate_otp(length: int = 4) -> str:
     """Generate a random OTP"""
     return ''.join(secrets.choice('0123456789') for _ in range(length))
@@ -16,7 +16,7 @@ from schemas import (
     MenuItemCreate, MenuItemUpdate, OrderCreate, OrderUpdate,
     TeamMemberPlanCreate, UserSessionCreate
 )
-from core.security import get_password_hash, verify_password, generate_otp
+from core.security import get_password_hash_async, generate_otp
 from core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -24,7 +24,7 @@ logger = logging.getLogger(__name__)
 # User CRUD
 async def create_user(db: AsyncSession, user: UserCreate) -> User:
     """Create a new user"""
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         name=user.name,
         username=user.username,
@@ -124,13 +124,13 @@ async def create_service(db: AsyncSession, service: ServiceCreate) -> Service:
     await db.refresh(db_service)
     return db_service
 
-async def get_service_by_id(db: AsyncSession, service_id: int) -> Optional[Service]:
-    """Get service by ID"""
-    result = await db.execute(
-        select(Service)
-        .options(selectinload(Service.menu_items))
-        .where(Service.id == service_id)
-    )
+async def get_service_by_id(db: AsyncSession, service_id: int, with_menu: bool = False) -> Optional[Service]:
+    """Get service by ID, optionally with its menu items"""
+    query = select(Service).where(Service.id == service_id)
+    if with_menu:
+        query = query.options(selectinload(Service.menu_items))
+    
+    result = await db.execute(query)
     return result.scalar_one_or_none()
 
 async def get_all_services(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Service]:
@@ -143,6 +143,22 @@ async def get_all_services(db: AsyncSession, skip: int = 0, limit: int = 100) ->
     )
     return result.scalars().all()
 
+async def get_all_services_summary(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    """Get service listing columns only, without building ORM objects"""
+    result = await db.execute(
+        select(
+            Service.id,
+            Service.name,
+            Service.description,
+            Service.image_url,
+            Service.created_at
+        )
+        .order_by(Service.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return [dict(row) for row in result.mappings()]
+
 async def update_service(db: AsyncSession, service_id: int, service_update: ServiceUpdate) -> Optional[Service]:
     """Update service"""
     db_service = await get_service_by_id(db, service_id)
@@ -159,7 +175,7 @@ async def update_service(db: AsyncSession, service_id: int, service_update: Serv
 
 async def delete_service(db: AsyncSession, service_id: int) -> bool:
     """Delete service"""
-    db_service = await get_service_by_id(db, service_id)
+    db_service = await get_service_by_id(db, service_id, with_menu=True)
     if not db_service:
         return False
     
@@ -312,9 +328,9 @@ async def get_all_orders(db: AsyncSession, skip: int = 0, limit: int = 100) -> L
     result = await db.execute(
         select(Order)
         .options(
-            selectinload(Order.customer),
-            selectinload(Order.service),
-            selectinload(Order.team_member),
+            joinedload(Order.customer),
+            joinedload(Order.service),
+            joinedload(Order.team_member),
             selectinload(Order.order_items).selectinload(OrderItem.menu_item)
         )
         .order_by(Order.created_at.desc())
@@ -339,14 +355,24 @@ async def update_order(db: AsyncSession, order_id: int, order_update: OrderUpdat
 
 async def assign_order_to_team_member(db: AsyncSession, order_id: int, team_member_id: int) -> Optional[Order]:
     """Assign order to team member"""
-    db_order = await get_order_by_id(db, order_id)
-    if not db_order:
+    result = await db.execute(
+        update(Order)
+        .where(Order.id == order_id)
+        .values(assigned_to=team_member_id)
+    )
+    if result.rowcount == 0:
         return None
     
-    db_order.assigned_to = team_member_id
     await db.commit()
-    await db.refresh(db_order)
-    return db_order
+    
+    # Load the assigned team member alongside the order in one query
+    result = await db.execute(
+        select(Order)
+        .options(selectinload(Order.team_member))
+        .where(Order.id == order_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
 
 async def generate_order_otp(db: AsyncSession, order_id: int) -> Optional[Dict[str, Any]]:
     """Generate OTP for order delivery confirmation"""
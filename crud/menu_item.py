@@ -120,11 +120,16 @@ class CRUDMenuItem:
     @staticmethod
     async def toggle_availability(db: AsyncSession, menu_item_id: int) -> Optional[MenuItem]:
         """Toggle menu item availability"""
-        menu_item = await CRUDMenuItem.get_by_id(db, menu_item_id)
+        # Flip the flag atomically in the database so concurrent toggles don't get lost
+        result = await db.execute(
+            update(MenuItem)
+            .where(MenuItem.id == menu_item_id)
+            .values(is_available=~MenuItem.is_available)
+            .returning(MenuItem)
+        )
+        menu_item = result.scalar_one_or_none()
         if not menu_item:
             raise NotFoundError("Menu item")
         
-        menu_item.is_available = not menu_item.is_available
         await db.commit()
-        await db.refresh(menu_item)
         return menu_item
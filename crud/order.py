@@ -2,10 +2,10 @@
 CRUD operations for Order model
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func, and_, or_
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import case, select, update, delete, func, and_, or_
+from sqlalchemy.orm import selectinload, joinedload, load_only
 from datetime import datetime, timedelta
 import pytz
 
@@ -19,6 +19,15 @@ from core.security import generate_otp, otp_expiry_time
 
 IST = pytz.timezone('Asia/Kolkata')
 
+# Timestamp column stamped when an order enters each status
+_STATUS_TIMESTAMPS = {
+    OrderStatus.CONFIRMED: "confirmed_at",
+    OrderStatus.PREPARING: "prepared_at",
+    OrderStatus.OUT_FOR_DELIVERY: "out_for_delivery_at",
+    OrderStatus.DELIVERED: "delivered_at",
+    OrderStatus.CANCELLED: "cancelled_at"
+}
+
 class CRUDOrder:
     """CRUD operations for Order model"""
     
@@ -30,7 +39,8 @@ class CRUDOrder:
         if with_items:
             query = query.options(
                 selectinload(Order.order_items).selectinload(OrderItem.menu_item),
-                selectinload(Order.customer),
+                # Many-to-one, so join it into the order row instead of a second query
+                joinedload(Order.customer),
                 selectinload(Order.service),
                 selectinload(Order.team_member)
             )
@@ -38,6 +48,19 @@ class CRUDOrder:
         result = await db.execute(query)
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_minimal(db: AsyncSession, order_id: int) -> Optional[Order]:
+        """Get an order with only id, assigned_to and status loaded
+        
+        For ownership checks and status changes that don't need the full row.
+        """
+        result = await db.execute(
+            select(Order)
+            .where(Order.id == order_id)
+            .options(load_only(Order.id, Order.assigned_to, Order.status))
+        )
+        return result.scalar_one_or_none()
+    
     @staticmethod
     async def create(db: AsyncSession, order_in: OrderCreate, customer_id: int) -> Order:
         """Create new order"""
@@ -123,20 +146,48 @@ class CRUDOrder:
         return True
     
     @staticmethod
-    async def get_customer_orders(db: AsyncSession, customer_id: int, limit: int = 50) -> List[Order]:
+    async def get_customer_orders(
+        db: AsyncSession, 
+        customer_id: int, 
+        limit: int = 50,
+        with_items: bool = True
+    ) -> List[Order]:
         """Get orders for a customer"""
-        result = await db.execute(
+        query = (
             select(Order)
             .where(Order.customer_id == customer_id)
-            .options(
-                selectinload(Order.order_items),
-                selectinload(Order.service)
-            )
+            .options(selectinload(Order.service))
             .order_by(Order.created_at.desc())
             .limit(limit)
         )
+        
+        if with_items:
+            query = query.options(selectinload(Order.order_items))
+        
+        result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_customer_stats(db: AsyncSession, customer_id: int) -> Dict[str, Any]:
+        """Get order totals for a customer in a single aggregate query"""
+        is_delivered = Order.status == OrderStatus.DELIVERED
+        result = await db.execute(
+            select(
+                func.count(Order.id),
+                func.count(case((is_delivered, Order.id))),
+                func.coalesce(func.sum(case((is_delivered, Order.total_amount))), 0)
+            )
+            .where(Order.customer_id == customer_id)
+        )
+        total_orders, delivered_orders, total_spent = result.one()
+        
+        return {
+            "total_orders": total_orders,
+            "delivered_orders": delivered_orders,
+            "active_orders": total_orders - delivered_orders,
+            "total_spent": total_spent
+        }
+    
     @staticmethod
     async def get_team_member_orders(db: AsyncSession, team_member_id: int) -> List[Order]:
         """Get orders assigned to a team member"""
@@ -163,11 +214,13 @@ class CRUDOrder:
         assigned_to: Optional[int] = None
     ) -> List[Order]:
         """Get all orders with filters"""
+        # Many-to-one relations ride along in the main query; only the
+        # order_items collection needs its own SELECT
         query = select(Order).options(
             selectinload(Order.order_items),
-            selectinload(Order.customer),
-            selectinload(Order.service),
-            selectinload(Order.team_member)
+            joinedload(Order.customer),
+            joinedload(Order.service),
+            joinedload(Order.team_member)
         )
         
         if status:
@@ -184,40 +237,98 @@ class CRUDOrder:
     @staticmethod
     async def assign_order(db: AsyncSession, order_id: int, team_member_id: int) -> Optional[Order]:
         """Assign order to team member"""
-        order = await CRUDOrder.get_by_id(db, order_id)
-        if not order:
-            raise NotFoundError("Order")
-        
         # Check if team member exists and is a team member
         team_member = await db.get(User, team_member_id)
         if not team_member or team_member.role != "team_member":
             raise ValidationError("Invalid team member")
         
-        order.assigned_to = team_member_id
+        # Single filtered UPDATE instead of load-modify-flush
+        result = await db.execute(
+            update(Order)
+            .where(Order.id == order_id)
+            .values(assigned_to=team_member_id)
+        )
+        if result.rowcount == 0:
+            raise NotFoundError("Order")
+        
         await db.commit()
-        await db.refresh(order)
-        return order
+        
+        # Return the order with its team member already loaded
+        result = await db.execute(
+            select(Order)
+            .where(Order.id == order_id)
+            .options(selectinload(Order.team_member))
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
     
     @staticmethod
-    async def generate_otp_for_delivery(db: AsyncSession, order_id: int) -> str:
-        """Generate OTP for order delivery"""
-        order = await CRUDOrder.get_by_id(db, order_id)
-        if not order:
-            raise NotFoundError("Order")
+    async def authorize_and_update_status(
+        db: AsyncSession,
+        order_id: int,
+        team_member_id: int,
+        new_status: OrderStatus,
+        from_statuses: Optional[List[OrderStatus]] = None
+    ) -> Optional[OrderStatus]:
+        """Move an assigned order to new_status in one UPDATE ... RETURNING
+        
+        The row only changes if it is assigned to team_member_id and, when
+        from_statuses is given, currently in one of them. Returns the new
+        status, or None if nothing matched. The caller commits.
+        """
+        stmt = (
+            update(Order)
+            .where(Order.id == order_id, Order.assigned_to == team_member_id)
+            .values(status=new_status)
+            .returning(Order.status)
+        )
+        if from_statuses is not None:
+            stmt = stmt.where(Order.status.in_(from_statuses))
+        timestamp_column = _STATUS_TIMESTAMPS.get(new_status)
+        if timestamp_column:
+            stmt = stmt.values({timestamp_column: func.now()})
         
-        # Generate new OTP
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    @staticmethod
+    async def generate_otp_for_delivery(
+        db: AsyncSession,
+        order_id: int,
+        team_member_id: int
+    ) -> Tuple[str, Optional[str]]:
+        """Issue a delivery OTP and return it with the customer's phone
+        
+        One UPDATE ... RETURNING: only the assigned team member can issue it,
+        and the phone comes back without loading the order.
+        """
         otp = generate_otp()
-        order.otp = otp
-        order.otp_expiry = otp_expiry_time()
-        order.otp_attempts = 0
+        result = await db.execute(
+            update(Order)
+            .where(Order.id == order_id, Order.assigned_to == team_member_id)
+            .values(otp=otp, otp_expiry=otp_expiry_time(), otp_attempts=0)
+            .returning(
+                select(User.phone)
+                .where(User.id == Order.customer_id)
+                .scalar_subquery()
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise NotFoundError("Order")
         
         await db.commit()
-        return otp
+        return otp, row[0]
     
     @staticmethod
     async def verify_otp(db: AsyncSession, order_id: int, otp: str) -> bool:
         """Verify OTP for order delivery"""
-        order = await CRUDOrder.get_by_id(db, order_id)
+        # Only the OTP columns are needed to decide
+        result = await db.execute(
+            select(Order.otp, Order.otp_expiry, Order.otp_attempts)
+            .where(Order.id == order_id)
+        )
+        order = result.one_or_none()
         if not order:
             raise NotFoundError("Order")
         
@@ -231,15 +342,25 @@ class CRUDOrder:
         
         # Verify OTP
         if order.otp != otp:
-            order.otp_attempts += 1
+            await db.execute(
+                update(Order)
+                .where(Order.id == order_id)
+                .values(otp_attempts=Order.otp_attempts + 1)
+            )
             await db.commit()
             return False
         
-        # OTP verified - mark as delivered
-        order.update_status(OrderStatus.DELIVERED)
-        order.otp = None
-        order.otp_expiry = None
-        
+        # OTP verified - mark as delivered in one set-oriented UPDATE
+        await db.execute(
+            update(Order)
+            .where(Order.id == order_id)
+            .values(
+                status=OrderStatus.DELIVERED,
+                otp=None,
+                otp_expiry=None,
+                **{_STATUS_TIMESTAMPS[OrderStatus.DELIVERED]: func.now()}
+            )
+        )
         await db.commit()
         return True
     
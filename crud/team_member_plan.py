@@ -4,8 +4,8 @@ CRUD operations for TeamMemberPlan model
 
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Row, select, update, delete, and_
+from sqlalchemy.orm import selectinload, joinedload
 
 from models.team_member_plan import TeamMemberPlan
 from models.user import User
@@ -16,12 +16,28 @@ class CRUDTeamMemberPlan:
     """CRUD operations for TeamMemberPlan model"""
     
     @staticmethod
-    async def get_by_id(db: AsyncSession, plan_id: int) -> Optional[TeamMemberPlan]:
+    async def get_by_id(db: AsyncSession, plan_id: int, with_admin: bool = False) -> Optional[TeamMemberPlan]:
         """Get plan by ID"""
+        query = select(TeamMemberPlan).where(TeamMemberPlan.id == plan_id)
+        
+        if with_admin:
+            query = query.options(joinedload(TeamMemberPlan.admin))
+        
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+    
+    @staticmethod
+    async def get_plan_ref(db: AsyncSession, plan_id: int) -> Optional[Row]:
+        """Get (id, team_member_id, is_read, created_at) for a plan, or None"""
         result = await db.execute(
-            select(TeamMemberPlan).where(TeamMemberPlan.id == plan_id)
+            select(
+                TeamMemberPlan.id,
+                TeamMemberPlan.team_member_id,
+                TeamMemberPlan.is_read,
+                TeamMemberPlan.created_at
+            ).where(TeamMemberPlan.id == plan_id)
         )
-        return result.scalar_one_or_none()
+        return result.one_or_none()
     
     @staticmethod
     async def create(
@@ -30,15 +46,22 @@ class CRUDTeamMemberPlan:
         admin_id: int
     ) -> List[TeamMemberPlan]:
         """Create new plans for team members"""
+        # Validate all team members in one query
+        result = await db.execute(
+            select(User.id).where(
+                User.id.in_(plan_in.team_member_ids),
+                User.role == "team_member"
+            )
+        )
+        valid_ids = set(result.scalars().all())
+        
+        plan_data = plan_in.model_dump(exclude={"team_member_ids"})
         created_plans = []
         
         for team_member_id in plan_in.team_member_ids:
-            # Check if team member exists and is a team member
-            team_member = await db.get(User, team_member_id)
-            if not team_member or team_member.role != "team_member":
+            if team_member_id not in valid_ids:
                 raise ValidationError(f"Invalid team member ID: {team_member_id}")
             
-            plan_data = plan_in.model_dump(exclude={"team_member_ids"})
             plan = TeamMemberPlan(
                 **plan_data,
                 admin_id=admin_id,
@@ -49,20 +72,26 @@ class CRUDTeamMemberPlan:
         
         await db.commit()
         
-        # Refresh all created plans
-        for plan in created_plans:
-            await db.refresh(plan)
-        
-        return created_plans
+        # Reload the new plans with admin and team member in one round trip
+        result = await db.execute(
+            select(TeamMemberPlan)
+            .where(TeamMemberPlan.id.in_([plan.id for plan in created_plans]))
+            .options(
+                selectinload(TeamMemberPlan.admin),
+                selectinload(TeamMemberPlan.team_member)
+            )
+            .order_by(TeamMemberPlan.id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().all()
     
     @staticmethod
     async def delete(db: AsyncSession, plan_id: int) -> bool:
         """Delete plan"""
-        plan = await CRUDTeamMemberPlan.get_by_id(db, plan_id)
-        if not plan:
+        result = await db.execute(delete(TeamMemberPlan).where(TeamMemberPlan.id == plan_id))
+        if result.rowcount == 0:
             raise NotFoundError("Plan")
         
-        await db.delete(plan)
         await db.commit()
         return True
     
@@ -97,6 +126,21 @@ class CRUDTeamMemberPlan:
         
         return plan
     
+    @staticmethod
+    async def mark_read_once(db: AsyncSession, plan_id: int, team_member_id: int) -> bool:
+        """Flag a plan read if it isn't yet; True if this call changed it"""
+        result = await db.execute(
+            update(TeamMemberPlan)
+            .where(
+                TeamMemberPlan.id == plan_id,
+                TeamMemberPlan.team_member_id == team_member_id,
+                TeamMemberPlan.is_read.is_(False)
+            )
+            .values(is_read=True)
+        )
+        await db.commit()
+        return result.rowcount > 0
+    
     @staticmethod
     async def get_all_plans(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[TeamMemberPlan]:
         """Get all plans"""
@@ -4,19 +4,45 @@ CRUD operations for User model
 
 from typing import Optional, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Float, Row, String, case, cast, select, update, delete, func, and_, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import selectinload, aliased
+from sqlalchemy.sql.expression import FunctionElement
 from datetime import datetime, date, timedelta
 import pytz
 
 from models.user import User, UserRole
 from models.user_session import UserSession
+from models.order import Order, OrderStatus
+from models.order_item import OrderItem
+from models.service import Service
+from models.team_member_plan import TeamMemberPlan
 from schemas.user import UserCreate, UserUpdate
-from core.security import get_password_hash, verify_password
+from core.security import get_password_hash_async, verify_password_async
 from core.exceptions import NotFoundError, ValidationError
 
 IST = pytz.timezone('Asia/Kolkata')
 
+class minutes_between(FunctionElement):
+    """Minutes from the first timestamp to the second, NULL if either is NULL
+    
+    Production runs on Postgres and the tests on SQLite, which subtract
+    timestamps differently; this compiles to the right form for each.
+    """
+    type = Float()
+    name = "minutes_between"
+    inherit_cache = True
+
+@compiles(minutes_between)
+def _minutes_between_default(element, compiler, **kw):
+    start, end = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"(EXTRACT(EPOCH FROM {end} - {start}) / 60)"
+
+@compiles(minutes_between, "sqlite")
+def _minutes_between_sqlite(element, compiler, **kw):
+    start, end = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"((julianday({end}) - julianday({start})) * 1440)"
+
 class CRUDUser:
     """CRUD operations for User model"""
     
@@ -28,6 +54,16 @@ class CRUDUser:
         )
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_team_member_ref(db: AsyncSession, user_id: int) -> Optional[Row]:
+        """Get (id, name, username) for a team member, or None if not one"""
+        result = await db.execute(
+            select(User.id, User.name, User.username)
+            .where(User.id == user_id, User.role == UserRole.TEAM_MEMBER)
+            .limit(1)
+        )
+        return result.one_or_none()
+    
     @staticmethod
     async def get_by_username(db: AsyncSession, username: str) -> Optional[User]:
         """Get user by username"""
@@ -58,7 +94,7 @@ class CRUDUser:
         user = await CRUDUser.get_by_username(db, username)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return None
         return user
     
@@ -82,7 +118,7 @@ class CRUDUser:
         
         # Create user
         user_data = user_in.model_dump(exclude={"password"})
-        user_data["hashed_password"] = get_password_hash(user_in.password)
+        user_data["hashed_password"] = await get_password_hash_async(user_in.password)
         
         user = User(**user_data)
         db.add(user)
@@ -102,7 +138,7 @@ class CRUDUser:
         
         # Hash password if provided
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
         
         # Check unique constraints for updated fields
         if "username" in update_data and update_data["username"] != user.username:
@@ -131,11 +167,11 @@ class CRUDUser:
     @staticmethod
     async def delete(db: AsyncSession, user_id: int) -> bool:
         """Delete user"""
-        user = await CRUDUser.get_by_id(db, user_id)
-        if not user:
+        # Related rows are removed by the ON DELETE rules on their foreign keys
+        result = await db.execute(delete(User).where(User.id == user_id))
+        if result.rowcount == 0:
             raise NotFoundError("User")
         
-        await db.delete(user)
         await db.commit()
         return True
     
@@ -215,6 +251,177 @@ class CRUDUser:
         result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def dashboard_bundle(db: AsyncSession, team_member_id: int, today: date) -> Dict[str, Any]:
+        """Everything the team dashboard shows, in three queries
+        
+        Active orders and the five newest unread plans (a preview) come back
+        as plain dicts shaped like the ORM objects the template reads; the
+        total, unread and today's session counts come back together as
+        scalars.
+        """
+        customer = aliased(User)
+        admin = aliased(User)
+        
+        item_count = (
+            select(func.count(OrderItem.id))
+            .where(OrderItem.order_id == Order.id)
+            .scalar_subquery()
+        )
+        order_rows = await db.execute(
+            select(
+                # The template compares against OrderStatus values
+                # ("out_for_delivery"); an Enum column would yield its label
+                Order.id, func.lower(cast(Order.status, String)),
+                Order.total_amount, Order.created_at,
+                item_count.label("item_count"),
+                Service.name, Service.image_url,
+                customer.name, customer.phone
+            )
+            .join(Service, Service.id == Order.service_id)
+            .join(customer, customer.id == Order.customer_id)
+            .where(Order.assigned_to == team_member_id)
+            .where(Order.status.notin_([OrderStatus.DELIVERED, OrderStatus.CANCELLED]))
+            .order_by(Order.created_at.desc())
+        )
+        orders = [
+            {
+                "id": order_id,
+                "status": order_status,
+                "total_amount": total_amount,
+                "created_at": created_at,
+                "item_count": items,
+                "service": {"name": service_name, "image_url": image_url},
+                "customer": {"name": customer_name, "phone": customer_phone}
+            }
+            for (order_id, order_status, total_amount, created_at, items,
+                 service_name, image_url, customer_name, customer_phone) in order_rows
+        ]
+        
+        plan_rows = await db.execute(
+            select(
+                TeamMemberPlan.id, TeamMemberPlan.description,
+                TeamMemberPlan.created_at, admin.name
+            )
+            .join(admin, admin.id == TeamMemberPlan.admin_id)
+            .where(TeamMemberPlan.team_member_id == team_member_id)
+            .where(TeamMemberPlan.is_read.is_(False))
+            .order_by(TeamMemberPlan.created_at.desc())
+            .limit(5)
+        )
+        plans = [
+            {
+                "id": plan_id,
+                "description": description,
+                "created_at": created_at,
+                "admin": {"name": admin_name}
+            }
+            for plan_id, description, created_at, admin_name in plan_rows
+        ]
+        
+        counts = await db.execute(
+            select(
+                select(func.count(TeamMemberPlan.id))
+                    .where(TeamMemberPlan.team_member_id == team_member_id)
+                    .scalar_subquery(),
+                select(func.count(TeamMemberPlan.id))
+                    .where(TeamMemberPlan.team_member_id == team_member_id)
+                    .where(TeamMemberPlan.is_read.is_(False))
+                    .scalar_subquery(),
+                select(func.count(UserSession.id))
+                    .where(UserSession.user_id == team_member_id, UserSession.date == today)
+                    .scalar_subquery()
+            )
+        )
+        plan_total, unread_count, session_count = counts.one()
+        
+        return {
+            "orders": orders,
+            "unread_plans": plans,
+            "unread_count": unread_count,
+            "plan_total": plan_total,
+            "session_count": session_count
+        }
+    
+    @staticmethod
+    async def get_team_member_counts(db: AsyncSession, team_member_id: int) -> Dict[str, int]:
+        """Assigned/delivered order and total/read plan counts in one SELECT"""
+        is_delivered = Order.status == OrderStatus.DELIVERED
+        result = await db.execute(
+            select(
+                select(func.count(Order.id))
+                    .where(Order.assigned_to == team_member_id)
+                    .scalar_subquery(),
+                select(func.count(case((is_delivered, Order.id))))
+                    .where(Order.assigned_to == team_member_id)
+                    .scalar_subquery(),
+                select(func.count(TeamMemberPlan.id))
+                    .where(TeamMemberPlan.team_member_id == team_member_id)
+                    .scalar_subquery(),
+                select(func.count(case((TeamMemberPlan.is_read.is_(True), TeamMemberPlan.id))))
+                    .where(TeamMemberPlan.team_member_id == team_member_id)
+                    .scalar_subquery()
+            )
+        )
+        total_orders, delivered_orders, total_plans, read_plans = result.one()
+        
+        return {
+            "total_orders": total_orders,
+            "delivered_orders": delivered_orders,
+            "total_plans": total_plans,
+            "read_plans": read_plans
+        }
+    
+    @staticmethod
+    async def get_attendance_summary(
+        db: AsyncSession,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[Row]:
+        """Per-day session count, first login, last logout and minutes, newest first"""
+        query = (
+            select(
+                UserSession.date,
+                func.count(UserSession.id).label("sessions"),
+                func.min(UserSession.login_time).label("first_login"),
+                func.max(UserSession.logout_time).label("last_logout"),
+                func.coalesce(
+                    func.sum(minutes_between(UserSession.login_time, UserSession.logout_time)),
+                    0
+                ).label("minutes")
+            )
+            .where(UserSession.user_id == user_id)
+            .group_by(UserSession.date)
+            .order_by(UserSession.date.desc())
+        )
+        
+        if start_date:
+            query = query.where(UserSession.date >= start_date)
+        
+        if end_date:
+            query = query.where(UserSession.date <= end_date)
+        
+        result = await db.execute(query)
+        return result.all()
+    
+    @staticmethod
+    async def get_session_stats(db: AsyncSession, user_id: int) -> Dict[str, Any]:
+        """Get session count and total online minutes for a user"""
+        result = await db.execute(
+            select(
+                func.count(UserSession.id),
+                func.sum(minutes_between(UserSession.login_time, UserSession.logout_time))
+            )
+            .where(UserSession.user_id == user_id)
+        )
+        session_count, total_minutes = result.one()
+        
+        return {
+            "session_count": session_count,
+            "total_minutes": round(float(total_minutes or 0), 2)
+        }
+    
     @staticmethod
     async def get_online_time_report(
         db: AsyncSession,
@@ -230,7 +437,7 @@ class CRUDUser:
             User.role,
             func.count(UserSession.id).label("session_count"),
             func.sum(
-                func.extract('epoch', UserSession.logout_time - UserSession.login_time) / 60
+                minutes_between(UserSession.login_time, UserSession.logout_time)
             ).label("total_minutes")
         ).join(UserSession, User.id == UserSession.user_id)
         
@@ -2,9 +2,11 @@
 Database configuration for Render with PostgreSQL + asyncpg
 """
 
+import asyncio
 import os
+from typing import Any, Awaitable, Callable, List
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import declarative_base
 import logging
 
@@ -41,12 +43,29 @@ if "asyncpg" not in DATABASE_URL:
 
 logger.info(f"Using database: {DATABASE_URL.split('@')[1] if '@' in DATABASE_URL else 'local'}")
 
+# ========== POOL CONFIGURATION ==========
+# Sizes are per worker process. Render's free/starter Postgres allows only a
+# small number of connections (see the plan's limit), so keep
+# (DB_POOL_SIZE + DB_MAX_OVERFLOW) * WORKERS (settings.WORKERS, default 1)
+# below it: the defaults open at most 10 per worker.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+# Connections opened per worker at startup; the rest are opened on demand
+DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", "2"))
+
 # ========== CREATE ASYNC ENGINE ==========
 try:
     engine = create_async_engine(
         DATABASE_URL,
         echo=False,  # Production: False, Development: True
-        poolclass=NullPool,  # Required for Render
+        # Render previously required NullPool to stay under its connection
+        # limit; a small bounded pool (sized above) does the same while
+        # reusing connections across requests
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
         pool_pre_ping=True,
         connect_args={
             "command_timeout": 60,
@@ -94,6 +113,24 @@ async def get_db():
         finally:
             await session.close()
 
+async def run_read(query: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+    """Run one read on a short-lived session, returning its connection at once
+    
+    Use instead of the request-scoped session when the handler has more work
+    (e.g. rendering) to do after its last query. Results come back detached,
+    so relationships must be eager-loaded by the query itself.
+    """
+    async with AsyncSessionLocal() as session:
+        return await query(session)
+
+async def gather_reads(*queries: Callable[[AsyncSession], Awaitable[Any]]) -> List[Any]:
+    """Run independent read queries concurrently
+    
+    An AsyncSession allows one operation at a time, so each query gets its
+    own short-lived session from the pool (see run_read).
+    """
+    return list(await asyncio.gather(*(run_read(query) for query in queries)))
+
 async def test_connection():
     """Test database connection"""
     try:
@@ -109,52 +146,17 @@ async def test_connection():
         logger.error(f"❌ Database connection failed: {e}")
         return False
 
-async def create_tables():
-    """Create all tables"""
-    try:
-        async with engine.begin() as conn:
-            # Import models first
-            import models
-            await conn.run_sync(Base.metadata.create_all)
-            
-            # Count tables
-            result = await conn.execute("""
-                SELECT COUNT(*) 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public'
-            """)
-            count = result.scalar()
-            logger.info(f"✅ Created/verified {count} database tables")
-            return True
-    except Exception as e:
-        logger.error(f"❌ Failed to create tables: {e}")
-        return False
-
-async def get_database_info():
-    """Get database information"""
-    try:
-        async with engine.connect() as conn:
-            # Get database info
-            result = await conn.execute("""
-                SELECT 
-                    current_database() as db_name,
-                    current_user as db_user,
-                    inet_server_addr() as host,
-                    inet_server_port() as port,
-                    version() as version
-            """)
-            info = result.first()
-            return {
-                "database": info[0],
-                "user": info[1],
-                "host": info[2],
-                "port": info[3],
-                "version": info[4]
-            }
-    except Exception as e:
-        logger.error(f"Failed to get database info: {e}")
-        return None
-
-# ========== INITIALIZE ON IMPORT ==========
-# This helps catch configuration errors early
-logger.info("Database module loaded successfully")
\ No newline at end of file
+async def warm_pool(size: int = min(DB_POOL_WARM, DB_POOL_SIZE)):
+    """Open pool connections up front so the first requests skip the handshake"""
+    # Checking out concurrently forces the pool to create distinct connections;
+    # collect failures too so every connection that did open is returned
+    results = await asyncio.gather(*(engine.connect() for _ in range(size)), return_exceptions=True)
+    conns = [r for r in results if not isinstance(r, BaseException)]
+    for conn in conns:
+        await conn.close()
+    
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        logger.warning(f"⚠️ Database pool warmup failed for {len(errors)} of {size} connections: {errors[0]}")
+    else:
+        logger.info(f"✅ Database pool warmed with {len(conns)} connections")
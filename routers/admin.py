@@ -3,7 +3,9 @@ Admin router for Bite Me Buddy
 """
 
 from typing import List, Dict, Any
+from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 import os
 import shutil
@@ -12,7 +14,7 @@ from pathlib import Path
 import logging
 
 from database import get_db
-from models import User
+from models import User, Order, Service, TeamMemberPlan
 from schemas import (
     UserCreate, UserResponse, TeamMemberPlanCreate, TeamMemberPlanResponse,
     UserOnlineStats
@@ -33,9 +35,6 @@ async def get_dashboard_stats(
     current_user: User = Depends(require_role("admin"))
 ):
     """Get dashboard statistics (admin only)"""
-    from sqlalchemy import func, select
-    from models import User, Order, Service
-    
     # Total users by role
     result = await db.execute(
         select(User.role, func.count(User.id))
@@ -52,7 +51,6 @@ async def get_dashboard_stats(
     total_orders = result.scalar()
     
     # Recent orders (last 7 days)
-    from datetime import datetime, timedelta
     week_ago = datetime.utcnow() - timedelta(days=7)
     result = await db.execute(
         select(func.count(Order.id))
@@ -111,7 +109,6 @@ async def upload_plan_image(
 ):
     """Upload plan image (admin only)"""
     # Check plan exists
-    from crud import get_team_member_plan_by_id
     plan = await get_team_member_plan_by_id(db, plan_id)
     if not plan:
         raise HTTPException(
@@ -179,9 +176,6 @@ async def get_todays_plans_admin(
 # Additional helper function for CRUD
 async def get_team_member_plan_by_id(db: AsyncSession, plan_id: int):
     """Get team member plan by ID"""
-    from sqlalchemy import select
-    from models import TeamMemberPlan
-    
     result = await db.execute(
         select(TeamMemberPlan).where(TeamMemberPlan.id == plan_id)
     )
@@ -3,22 +3,42 @@ Authentication router for Bite Me Buddy
 """
 
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
-from database import get_db
+from database import get_db, run_read
 from models import User
 from schemas import UserCreate, UserLogin, UserResponse
-from crud import create_user, get_user_by_username, create_user_session, update_user_session_logout
-from core.security import verify_password, create_access_token, verify_token, get_password_hash
+from crud import (
+    create_user, get_user_by_username, get_user_by_email, get_user_by_phone,
+    create_user_session, update_user_session_logout
+)
+from core.security import (
+    verify_password_async, create_access_token, verify_token_cached, forget_token,
+    get_password_hash_async, sign_session_id, unsign_session_id
+)
+from core.cache import (
+    save_login_session, pop_login_session,
+    create_cookie_session, get_cookie_session, delete_cookie_session,
+    hit_rate_limit
+)
 from core.config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+# Where each role lands after signing in
+ROLE_REDIRECT = {
+    "customer": "/customer/dashboard",
+    "team_member": "/team/dashboard",
+    "admin": "/admin/dashboard"
+}
 
 async def get_current_user(
     request: Request,
@@ -33,7 +53,7 @@ async def get_current_user(
         )
     
     token = credentials.credentials
-    payload = verify_token(token)
+    payload = verify_token_cached(token)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -58,8 +78,13 @@ async def get_current_user(
     request.state.user = user
     return user
 
-async def require_role(role: str):
-    """Dependency to require specific role"""
+@lru_cache(maxsize=None)
+def require_role(role: str):
+    """Dependency to require specific role
+    
+    Memoized so every ``Depends(require_role(role))`` shares one checker and
+    FastAPI's per-request dependency cache resolves it (and the user) once.
+    """
     async def role_checker(user: User = Depends(get_current_user)):
         if user.role != role and user.role != "admin":
             raise HTTPException(
@@ -69,6 +94,70 @@ async def require_role(role: str):
         return user
     return role_checker
 
+async def _issue_session(user: User, response: Response, db: AsyncSession) -> str:
+    """Open a session for an authenticated user and set the auth cookie"""
+    # Create access token
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user.username},
+        expires_delta=access_token_expires
+    )
+    
+    # Create user session
+    session = await create_user_session(db, user.id)
+    await save_login_session(user.id, session.id)
+    
+    # Browser pages authenticate with an opaque session id instead of the JWT
+    sid = await create_cookie_session({
+        "user_id": user.id,
+        "username": user.username,
+        "role": getattr(user.role, "value", user.role)
+    })
+    
+    # Set cookies
+    for key, value in (("access_token", access_token), ("sid", sign_session_id(sid))):
+        response.set_cookie(
+            key=key,
+            value=value,
+            httponly=True,
+            max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            secure=not settings.DEBUG,
+            samesite="lax"
+        )
+    return access_token
+
+def _cookie_sid(request: Request) -> Optional[str]:
+    """Session id from the signed sid cookie, if present and untampered"""
+    cookie = request.cookies.get("sid")
+    return unsign_session_id(cookie) if cookie else None
+
+async def get_cookie_identity(request: Request) -> Optional[Dict[str, Any]]:
+    """Resolve the browser session cookie to {user_id, username, role}
+    
+    Falls back to the JWT cookie for sessions issued before the sid cookie;
+    its payload only carries the username, so the user is looked up.
+    """
+    sid = _cookie_sid(request)
+    if sid:
+        identity = await get_cookie_session(sid)
+        if identity is not None:
+            return identity
+    
+    token = request.cookies.get("access_token")
+    payload = verify_token_cached(token) if token else None
+    username = payload.get("sub") if payload else None
+    if username is None:
+        return None
+    
+    user = await run_read(lambda s: get_user_by_username(s, username))
+    if user is None:
+        return None
+    return {
+        "user_id": user.id,
+        "username": user.username,
+        "role": getattr(user.role, "value", user.role)
+    }
+
 @router.post("/register", response_model=UserResponse)
 async def register(
     user: UserCreate,
@@ -106,25 +195,8 @@ async def register(
     # Create user
     db_user = await create_user(db, user)
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": db_user.username},
-        expires_delta=access_token_expires
-    )
-    
-    # Create user session
-    await create_user_session(db, db_user.id)
-    
-    # Set cookie
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        secure=not settings.DEBUG,
-        samesite="lax"
-    )
+    # New accounts are signed in directly; no second password check
+    await _issue_session(db_user, response, db)
     
     logger.info(f"User registered: {db_user.username}")
     return db_user
@@ -137,6 +209,17 @@ async def login(
     db: AsyncSession = Depends(get_db)
 ):
     """Login user"""
+    # Throttle before bcrypt runs so guessing can't tie up the workers.
+    # Keyed on the socket peer: X-Forwarded-For is client-controlled
+    client_host = request.client.host if request.client else "unknown"
+    rate_key = f"rl:login:{client_host}:{user_login.username}"
+    if await hit_rate_limit(rate_key, settings.LOGIN_RATE_LIMIT, settings.LOGIN_RATE_WINDOW_SECONDS):
+        logger.warning(f"Login rate limit hit for {user_login.username}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later"
+        )
+    
     # Get user
     user = await get_user_by_username(db, user_login.username)
     if not user:
@@ -146,56 +229,67 @@ async def login(
         )
     
     # Verify password
-    if not verify_password(user_login.password, user.hashed_password):
+    if not await verify_password_async(user_login.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.username},
-        expires_delta=access_token_expires
-    )
-    
-    # Create user session
-    session = await create_user_session(db, user.id)
-    request.state.session_id = session.id
-    
-    # Set cookie
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        secure=not settings.DEBUG,
-        samesite="lax"
-    )
+    access_token = await _issue_session(user, response, db)
     
     logger.info(f"User logged in: {user.username}")
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user": UserResponse.model_validate(user)
+        "user": UserResponse.model_validate(user),
+        "redirect": ROLE_REDIRECT.get(getattr(user.role, "value", user.role), "/")
     }
 
 @router.post("/logout")
 async def logout(
     request: Request,
     response: Response,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Logout user"""
-    # Update session logout time
-    if hasattr(request.state, "session_id"):
-        await update_user_session_logout(db, request.state.session_id)
+    """Logout user
+    
+    Idempotent: a missing or expired token still clears the cookies.
+    """
+    tokens = [t for t in (credentials.credentials if credentials else None,
+                          request.cookies.get("access_token")) if t]
+    sid = _cookie_sid(request)
+    
+    # Work out who is logging out without failing on stale credentials
+    identity = await get_cookie_session(sid) if sid else None
+    user_id = identity.get("user_id") if identity else None
+    username = identity.get("username") if identity else None
+    if user_id is None:
+        for token in tokens:
+            payload = verify_token_cached(token)
+            if payload and payload.get("sub"):
+                user = await get_user_by_username(db, payload["sub"])
+                if user:
+                    user_id, username = user.id, user.username
+                break
+    
+    # Stop honouring cached verifications of these tokens
+    for token in tokens:
+        forget_token(token)
+    
+    # Drop the login and cookie sessions together, then close the DB row
+    if user_id is not None:
+        session_id = await pop_login_session(user_id, sid)
+        if session_id is not None:
+            await update_user_session_logout(db, session_id)
+    elif sid:
+        await delete_cookie_session(sid)
     
-    # Clear cookie
+    # Clear cookies
     response.delete_cookie("access_token")
+    response.delete_cookie("sid")
     
-    logger.info(f"User logged out: {user.username}")
+    logger.info(f"User logged out: {username or 'anonymous'}")
     return {"message": "Successfully logged out"}
 
 @router.get("/me", response_model=UserResponse)
@@ -214,14 +308,14 @@ async def change_password(
 ):
     """Change user password"""
     # Verify old password
-    if not verify_password(old_password, user.hashed_password):
+    if not await verify_password_async(old_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid old password"
         )
     
     # Update password
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await get_password_hash_async(new_password)
     await db.commit()
     await db.refresh(user)
     
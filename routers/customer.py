@@ -19,24 +19,56 @@ from crud.user import CRUDUser
 from crud.service import CRUDService
 from crud.menu_item import CRUDMenuItem
 from crud.order import CRUDOrder
-from core.security import verify_token
-from core.exceptions import AuthenticationError, NotFoundError
+from routers.auth import get_cookie_identity
+from core.exceptions import AuthenticationError, NotFoundError, htmx_safe
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
 logger = structlog.get_logger(__name__)
 
-def get_current_customer(request: Request, db: AsyncSession = Depends(get_db)):
-    """Get current customer from token"""
-    token = request.cookies.get("access_token")
-    if not token:
+# Cart total + item-count badge swapped in by HTMX after every cart change
+_CART_SUMMARY = (
+    '<span id="cart-total">₹{total:.2f}</span>\n'
+    '<span class="badge bg-danger rounded-pill ms-2" id="cart-count">{count}</span>'
+)
+
+# Recent orders listed on the dashboard
+_DASHBOARD_ORDERS = 5
+
+# Display format for order timestamps
+_HUMAN_DT = "%d %b %Y, %I:%M %p"
+
+# One line item in the order details modal
+_ORDER_ITEM_ROW = (
+    "<tr><td>{0}</td><td>{1}</td><td>₹{2:.2f}</td><td>₹{3:.2f}</td></tr>"
+)
+
+# Badge colour per order status; anything else is shown as danger
+_ORDER_BADGE = {
+    OrderStatus.PENDING: "info",
+    OrderStatus.PREPARING: "warning",
+    OrderStatus.DELIVERED: "success"
+}
+
+def _badge(order_status: str) -> str:
+    """Bootstrap badge colour for an order status"""
+    return _ORDER_BADGE.get(order_status, "danger")
+
+def _render_cart_summary(cart: dict) -> str:
+    """Render the cart total and item-count fragment"""
+    total = sum(item["price"] * item["quantity"] for item in cart.values())
+    return _CART_SUMMARY.format(total=total, count=len(cart))
+
+async def get_current_customer(request: Request, db: AsyncSession = Depends(get_db)):
+    """Get current customer from session cookie"""
+    identity = await get_cookie_identity(request)
+    if not identity:
         raise AuthenticationError("Not authenticated")
     
-    payload = verify_token(token)
-    if payload.get("role") != "customer":
+    if identity.get("role") != "customer":
         raise AuthenticationError("Access denied")
     
-    user = CRUDUser.get_by_id(db, payload.get("user_id"))
+    user = await CRUDUser.get_by_id(db, identity.get("user_id"))
     if not user or user.role != UserRole.CUSTOMER:
         raise AuthenticationError("Invalid user")
     
@@ -51,13 +83,17 @@ async def customer_dashboard(
     try:
         customer = await get_current_customer(request, db)
         
-        # Get recent orders
-        orders = await CRUDOrder.get_customer_orders(db, customer.id, limit=5)
+        # Fetch only the rows the table shows; totals are aggregated in SQL
+        orders = await CRUDOrder.get_customer_orders(
+            db, customer.id, limit=_DASHBOARD_ORDERS, with_items=False
+        )
+        stats = await CRUDOrder.get_customer_stats(db, customer.id)
         
         return templates.TemplateResponse("customer/dashboard.html", {
             "request": request,
             "customer": customer,
-            "orders": orders
+            "orders": orders,
+            "stats": stats
         })
     except AuthenticationError:
         return RedirectResponse(url="/auth/login?role=customer", status_code=303)
@@ -190,72 +226,48 @@ async def view_cart(
         return RedirectResponse(url="/auth/login?role=customer", status_code=303)
 
 @router.post("/cart/update")
+@htmx_safe
 async def update_cart_item(
     request: Request,
     menu_item_id: str = Form(...),
     quantity: int = Form(...)
 ):
     """Update cart item quantity"""
-    try:
-        cart = request.session.get("cart", {})
-        
-        if quantity <= 0:
-            if menu_item_id in cart:
-                del cart[menu_item_id]
-        else:
-            if menu_item_id in cart:
-                cart[menu_item_id]["quantity"] = quantity
-        
-        request.session["cart"] = cart
-        
-        # Recalculate totals for HTMX response
-        total = 0
-        for item_data in cart.values():
-            total += item_data["price"] * item_data["quantity"]
-        
-        return HTMLResponse(f"""
-            <span id="cart-total">₹{total:.2f}</span>
-            <span class="badge bg-danger rounded-pill ms-2" id="cart-count">{len(cart)}</span>
-        """)
-        
-    except Exception as e:
-        return HTMLResponse(f"""
-            <div class="alert alert-danger">{str(e)}</div>
-        """)
+    cart = request.session.get("cart", {})
+    
+    if quantity <= 0:
+        if menu_item_id in cart:
+            del cart[menu_item_id]
+    else:
+        if menu_item_id in cart:
+            cart[menu_item_id]["quantity"] = quantity
+    
+    request.session["cart"] = cart
+    
+    return HTMLResponse(_render_cart_summary(cart))
 
 @router.post("/cart/remove")
+@htmx_safe
 async def remove_cart_item(
     request: Request,
     menu_item_id: str = Form(...)
 ):
     """Remove item from cart"""
-    try:
-        cart = request.session.get("cart", {})
-        
-        if menu_item_id in cart:
-            item_name = cart[menu_item_id]["name"]
-            del cart[menu_item_id]
-            request.session["cart"] = cart
-            
-            # Recalculate total
-            total = 0
-            for item_data in cart.values():
-                total += item_data["price"] * item_data["quantity"]
-            
-            return HTMLResponse(f"""
-                <div class="alert alert-info">
-                    Removed {item_name} from cart
-                </div>
-                <span id="cart-total">₹{total:.2f}</span>
-                <span class="badge bg-danger rounded-pill ms-2" id="cart-count">{len(cart)}</span>
-            """)
-        
-        return HTMLResponse("")
+    cart = request.session.get("cart", {})
+    
+    if menu_item_id in cart:
+        item_name = cart[menu_item_id]["name"]
+        del cart[menu_item_id]
+        request.session["cart"] = cart
         
-    except Exception as e:
         return HTMLResponse(f"""
-            <div class="alert alert-danger">{str(e)}</div>
+            <div class="alert alert-info">
+                Removed {item_name} from cart
+            </div>
+            {_render_cart_summary(cart)}
         """)
+    
+    return HTMLResponse("")
 
 @router.post("/order/place")
 async def place_order(
@@ -340,90 +352,81 @@ async def my_orders(
         return RedirectResponse(url="/auth/login?role=customer", status_code=303)
 
 @router.get("/order/{order_id}")
+@htmx_safe
 async def order_details(
     request: Request,
     order_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     """Get order details"""
-    try:
-        customer = await get_current_customer(request, db)
-        order = await CRUDOrder.get_by_id(db, order_id, with_items=True)
-        
-        if not order or order.customer_id != customer.id:
-            raise NotFoundError("Order")
-        
-        # HTMX response for order details modal
-        items_html = ""
-        for item in order.order_items:
-            items_html += f"""
-            <tr>
-                <td>{item.item_name}</td>
-                <td>{item.quantity}</td>
-                <td>₹{item.unit_price:.2f}</td>
-                <td>₹{item.subtotal:.2f}</td>
-            </tr>
-            """
-        
-        return HTMLResponse(f"""
-            <div class="modal-content">
-                <div class="modal-header">
-                    <h5 class="modal-title">Order #{order.id}</h5>
-                    <button type="button" class="btn-close" data-bs-dismiss="modal"></button>
-                </div>
-                <div class="modal-body">
-                    <div class="row mb-3">
-                        <div class="col-6">
-                            <strong>Status:</strong>
-                            <span class="badge bg-{'info' if order.status == 'pending' else 'warning' if order.status == 'preparing' else 'success' if order.status == 'delivered' else 'danger'}">
-                                {order.status}
-                            </span>
-                        </div>
-                        <div class="col-6">
-                            <strong>Total:</strong> ₹{order.total_amount:.2f}
-                        </div>
-                    </div>
-                    
-                    <div class="mb-3">
-                        <strong>Address:</strong>
-                        <p class="mb-1">{order.address}</p>
-                        {f'<p><strong>Instructions:</strong> {order.special_instructions}</p>' if order.special_instructions else ''}
+    customer = await get_current_customer(request, db)
+    order = await CRUDOrder.get_by_id(db, order_id, with_items=True)
+    
+    if not order or order.customer_id != customer.id:
+        raise NotFoundError("Order")
+    
+    # The column may hold the enum or its raw string; unknown values still render
+    order_status = getattr(order.status, "value", order.status)
+    items_html = "".join(
+        _ORDER_ITEM_ROW.format(item.item_name, item.quantity, item.unit_price, item.subtotal)
+        for item in order.order_items
+    )
+    
+    # HTMX response for order details modal
+    return HTMLResponse(content=f"""
+        <div class="modal-content">
+            <div class="modal-header">
+                <h5 class="modal-title">Order #{order.id}</h5>
+                <button type="button" class="btn-close" data-bs-dismiss="modal"></button>
+            </div>
+            <div class="modal-body">
+                <div class="row mb-3">
+                    <div class="col-6">
+                        <strong>Status:</strong>
+                        <span class="badge bg-{_badge(order_status)}">
+                            {order_status}
+                        </span>
                     </div>
-                    
-                    <table class="table table-sm">
-                        <thead>
-                            <tr>
-                                <th>Item</th>
-                                <th>Qty</th>
-                                <th>Price</th>
-                                <th>Subtotal</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {items_html}
-                        </tbody>
-                        <tfoot>
-                            <tr>
-                                <td colspan="3" class="text-end"><strong>Total:</strong></td>
-                                <td><strong>₹{order.total_amount:.2f}</strong></td>
-                            </tr>
-                        </tfoot>
-                    </table>
-                    
-                    <div class="text-muted small">
-                        Ordered: {order.created_at.strftime('%d %b %Y, %I:%M %p')}
-                        {f'<br>Delivered: {order.delivered_at.strftime("%d %b %Y, %I:%M %p")}' if order.delivered_at else ''}
+                    <div class="col-6">
+                        <strong>Total:</strong> ₹{order.total_amount:.2f}
                     </div>
                 </div>
-                <div class="modal-footer">
-                    <button type="button" class="btn btn-secondary" data-bs-dismiss="modal">Close</button>
+                
+                <div class="mb-3">
+                    <strong>Address:</strong>
+                    <p class="mb-1">{order.address}</p>
+                    {f'<p><strong>Instructions:</strong> {order.special_instructions}</p>' if order.special_instructions else ''}
+                </div>
+                
+                <table class="table table-sm">
+                    <thead>
+                        <tr>
+                            <th>Item</th>
+                            <th>Qty</th>
+                            <th>Price</th>
+                            <th>Subtotal</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        {items_html}
+                    </tbody>
+                    <tfoot>
+                        <tr>
+                            <td colspan="3" class="text-end"><strong>Total:</strong></td>
+                            <td><strong>₹{order.total_amount:.2f}</strong></td>
+                        </tr>
+                    </tfoot>
+                </table>
+                
+                <div class="text-muted small">
+                    Ordered: {order.created_at.strftime(_HUMAN_DT)}
+                    {f'<br>Delivered: {order.delivered_at.strftime(_HUMAN_DT)}' if order.delivered_at else ''}
                 </div>
             </div>
-        """)
-        
-    except Exception as e:
-        return HTMLResponse(f"""
-            <div class="alert alert-danger">{str(e)}</div>
+            <div class="modal-footer">
+                <button type="button" class="btn btn-secondary" data-bs-dismiss="modal">Close</button>
+            </div>
+        </div>
         """)
 
 @router.get("/profile", response_class=HTMLResponse)
@@ -436,18 +439,13 @@ async def customer_profile(
         customer = await get_current_customer(request, db)
         
         # Get session statistics
-        sessions = await CRUDUser.get_user_sessions(db, customer.id)
-        
-        total_minutes = 0
-        for session in sessions:
-            if session.duration_minutes:
-                total_minutes += session.duration_minutes
+        session_stats = await CRUDUser.get_session_stats(db, customer.id)
         
         return templates.TemplateResponse("customer/profile.html", {
             "request": request,
             "customer": customer,
-            "sessions": len(sessions),
-            "total_minutes": round(total_minutes, 2)
+            "sessions": session_stats["session_count"],
+            "total_minutes": session_stats["total_minutes"]
         })
     except AuthenticationError:
         return RedirectResponse(url="/auth/login?role=customer", status_code=303)
@@ -3,13 +3,15 @@ Orders router for Bite Me Buddy
 """
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+import hashlib
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from database import get_db
-from models import User
-from schemas import OrderCreate, OrderUpdate, OrderResponse, OTPVerify, OTPResponse
+from models import User, Order
+from schemas import OrderCreate, OrderUpdate, OrderResponse, OrderListAdapter, OTPVerify, OTPResponse
 from crud import (
     create_order, get_order_by_id, get_orders_by_customer, get_orders_by_team_member,
     get_all_orders, update_order, assign_order_to_team_member, generate_order_otp, verify_order_otp
@@ -48,6 +50,11 @@ except ImportError:
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+def _orders_json(orders, headers=None) -> Response:
+    """Serialize order rows to a JSON array in one pass through pydantic-core"""
+    body = OrderListAdapter.dump_json(OrderListAdapter.validate_python(orders))
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @router.post("/", response_model=OrderResponse)
 async def create_new_order(
     order: OrderCreate,
@@ -68,7 +75,7 @@ async def read_my_orders(
 ):
     """Get current user's orders"""
     orders = await get_orders_by_customer(db, current_user.id, skip=skip, limit=limit)
-    return [OrderResponse.model_validate(order) for order in orders]
+    return _orders_json(orders)
 
 @router.get("/team-member-orders", response_model=List[OrderResponse])
 async def read_team_member_orders(
@@ -79,18 +86,29 @@ async def read_team_member_orders(
 ):
     """Get orders assigned to team member"""
     orders = await get_orders_by_team_member(db, current_user.id, skip=skip, limit=limit)
-    return [OrderResponse.model_validate(order) for order in orders]
+    return _orders_json(orders)
 
 @router.get("/all", response_model=List[OrderResponse])
 async def read_all_orders(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role("admin"))
 ):
     """Get all orders (admin only)"""
+    # Cheap validator: the listing only changes when an order is added,
+    # removed or updated, all of which move count/max(updated_at)
+    result = await db.execute(select(func.count(Order.id), func.max(Order.updated_at)))
+    total, last_modified = result.one()
+    etag = '"' + hashlib.md5(f"{total}:{last_modified}:{skip}:{limit}".encode()).hexdigest() + '"'
+    
+    cache_headers = {"ETag": etag, "Cache-Control": "private, max-age=10"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    
     orders = await get_all_orders(db, skip=skip, limit=limit)
-    return [OrderResponse.model_validate(order) for order in orders]
+    return _orders_json(orders, cache_headers)
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def read_order(
@@ -148,8 +166,9 @@ async def assign_order(
             detail="Order not found"
         )
     
-    logger.info(f"Order {order_id} assigned to team member {team_member_id}")
-    return {"message": "Order assigned successfully"}
+    team_member_name = order.team_member.name if order.team_member else None
+    logger.info(f"Order {order_id} assigned to team member {team_member_id} ({team_member_name})")
+    return {"message": "Order assigned successfully", "assigned_to": team_member_name}
 
 @router.post("/{order_id}/generate-otp", response_model=OTPResponse)
 async def generate_delivery_otp(
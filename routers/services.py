@@ -2,9 +2,13 @@
 Services router for Bite Me Buddy
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from typing import List, Union
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import TypeAdapter
+import orjson
+import hashlib
 import os
 import shutil
 import uuid
@@ -13,40 +17,83 @@ import logging
 
 from database import get_db
 from models import User
-from schemas import ServiceCreate, ServiceUpdate, ServiceResponse, MenuItemCreate, MenuItemUpdate, MenuItemResponse
+from schemas import ServiceCreate, ServiceUpdate, ServiceResponse, ServiceSummaryResponse, MenuItemCreate, MenuItemUpdate, MenuItemResponse
 from crud import (
-    create_service, get_service_by_id, get_all_services, update_service, delete_service,
+    create_service, get_service_by_id, get_all_services_summary, update_service, delete_service,
     create_menu_item, get_menu_items_by_service, get_menu_item_by_id, update_menu_item, delete_menu_item
 )
 from routers.auth import get_current_user, require_role
+from core.cache import cache_get_raw, cache_set_raw, cache_delete
 from core.config import settings
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
+# Catalog reads are cached briefly; admin writes invalidate them
+SERVICES_CACHE_TTL = 120  # seconds
+
+# Validate ORM rows and serialize them to JSON bytes, without intermediate dicts
+_service_adapter = TypeAdapter(ServiceResponse)
+_menu_items_adapter = TypeAdapter(List[MenuItemResponse])
+
+def _json_body(body: Union[str, bytes], request: Request) -> Response:
+    """Wrap an already-serialized JSON body in a response, honouring If-None-Match"""
+    if isinstance(body, str):
+        body = body.encode()
+    etag = 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    cache_headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    return Response(content=body, media_type="application/json", headers=cache_headers)
+
+async def invalidate_service_cache(service_id: int = None):
+    """Drop cached service listings and, if given, one service's entries"""
+    if service_id is None:
+        await cache_delete("services:*", "service:*")
+    else:
+        await cache_delete("services:*", f"service:{service_id}", f"service:{service_id}:*")
+
 # Service endpoints
-@router.get("/", response_model=List[ServiceResponse])
+@router.get("/", response_model=List[ServiceSummaryResponse])
 async def read_services(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db)
 ):
     """Get all services"""
-    return await get_all_services(db, skip=skip, limit=limit)
+    cache_key = f"services:all:{skip}:{limit}"
+    cached = await cache_get_raw(cache_key)
+    if cached is not None:
+        return _json_body(cached, request)
+    
+    services = await get_all_services_summary(db, skip=skip, limit=limit)
+    body = orjson.dumps(services)
+    await cache_set_raw(cache_key, body, SERVICES_CACHE_TTL)
+    return _json_body(body, request)
 
 @router.get("/{service_id}", response_model=ServiceResponse)
 async def read_service(
+    request: Request,
     service_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     """Get service by ID"""
+    cache_key = f"service:{service_id}"
+    cached = await cache_get_raw(cache_key)
+    if cached is not None:
+        return _json_body(cached, request)
+    
     service = await get_service_by_id(db, service_id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Service not found"
         )
-    return service
+    
+    body = _service_adapter.dump_json(_service_adapter.validate_python(service))
+    await cache_set_raw(cache_key, body, SERVICES_CACHE_TTL)
+    return _json_body(body, request)
 
 @router.post("/", response_model=ServiceResponse)
 async def create_new_service(
@@ -56,6 +103,7 @@ async def create_new_service(
 ):
     """Create a new service (admin only)"""
     db_service = await create_service(db, service)
+    await invalidate_service_cache()
     logger.info(f"Service created: {db_service.name} by {current_user.username}")
     return db_service
 
@@ -73,6 +121,7 @@ async def update_service_info(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Service not found"
         )
+    await invalidate_service_cache(service_id)
     logger.info(f"Service updated: {service.name} by {current_user.username}")
     return service
 
@@ -89,6 +138,7 @@ async def delete_service_info(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Service not found"
         )
+    await invalidate_service_cache(service_id)
     logger.info(f"Service deleted: {service_id} by {current_user.username}")
     return {"message": "Service deleted successfully"}
 
@@ -136,6 +186,7 @@ async def upload_service_image(
     await db.commit()
     await db.refresh(service)
     
+    await invalidate_service_cache(service_id)
     logger.info(f"Service image uploaded: {service.name}")
     return {
         "filename": unique_filename,
@@ -146,11 +197,27 @@ async def upload_service_image(
 # Menu Item endpoints
 @router.get("/{service_id}/menu-items", response_model=List[MenuItemResponse])
 async def read_service_menu_items(
+    request: Request,
     service_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     """Get all menu items for a service"""
-    return await get_menu_items_by_service(db, service_id)
+    cache_key = f"service:{service_id}:menu"
+    cached = await cache_get_raw(cache_key)
+    if cached is not None:
+        return _json_body(cached, request)
+    
+    menu_items = await get_menu_items_by_service(db, service_id)
+    # An empty menu is only worth a second query to tell it from a missing service
+    if not menu_items and not await get_service_by_id(db, service_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Service not found"
+        )
+    
+    body = _menu_items_adapter.dump_json(_menu_items_adapter.validate_python(menu_items))
+    await cache_set_raw(cache_key, body, SERVICES_CACHE_TTL)
+    return _json_body(body, request)
 
 @router.post("/{service_id}/menu-items", response_model=MenuItemResponse)
 async def create_service_menu_item(
@@ -173,6 +240,7 @@ async def create_service_menu_item(
     menu_item_data["service_id"] = service_id
     
     db_menu_item = await create_menu_item(db, MenuItemCreate(**menu_item_data))
+    await invalidate_service_cache(service_id)
     logger.info(f"Menu item created: {db_menu_item.name} for service {service.name}")
     return db_menu_item
 
@@ -190,6 +258,7 @@ async def update_menu_item_info(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Menu item not found"
         )
+    await invalidate_service_cache(menu_item.service_id)
     logger.info(f"Menu item updated: {menu_item.name}")
     return menu_item
 
@@ -206,6 +275,7 @@ async def delete_menu_item_info(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Menu item not found"
         )
+    await invalidate_service_cache()
     logger.info(f"Menu item deleted: {menu_item_id}")
     return {"message": "Menu item deleted successfully"}
 
@@ -253,6 +323,7 @@ async def upload_menu_item_image(
     await db.commit()
     await db.refresh(menu_item)
     
+    await invalidate_service_cache(menu_item.service_id)
     logger.info(f"Menu item image uploaded: {menu_item.name}")
     return {
         "filename": unique_filename,
@@ -3,73 +3,257 @@ Team member router for team member endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from types import MappingProxyType
+from typing import Optional, List, FrozenSet, Mapping, Tuple
+import asyncio
+import string
+import time
+from collections import OrderedDict
+from datetime import datetime, date
+from functools import lru_cache
+from html import escape
+from jinja2 import FileSystemBytecodeCache, Template, TemplateNotFound
 import structlog
 
-from database import get_db
+from database import get_db, gather_reads, run_read
 from models.user import User, UserRole
 from models.order import Order, OrderStatus
 from models.team_member_plan import TeamMemberPlan
 from crud.user import CRUDUser
 from crud.order import CRUDOrder
 from crud.team_member_plan import CRUDTeamMemberPlan
-from core.security import verify_token
-from core.exceptions import AuthenticationError, NotFoundError
+from routers.auth import get_cookie_identity
+from core.exceptions import AuthenticationError, NotFoundError, ValidationError, htmx_safe
 from core.sms import send_sms
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
 logger = structlog.get_logger(__name__)
 
-def get_current_team_member(request: Request, db: AsyncSession = Depends(get_db)):
-    """Get current team member from token"""
-    token = request.cookies.get("access_token")
-    if not token:
+# Templates only change on deploy: keep compiled bytecode on disk and skip
+# the per-render freshness check
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+templates.env.auto_reload = False
+templates.env.cache_size = 400
+
+_DATE_FMT = "%Y-%m-%d"
+_TIME_FMT = "%I:%M %p"
+_DATETIME_FMT = "%d %b %Y, %I:%M %p"
+
+def _human_datetime(value: Optional[datetime]) -> str:
+    """Jinja filter: one shared display format for timestamps, blank for None"""
+    return value.strftime(_DATETIME_FMT) if value else ""
+
+# Registered before the templates below are compiled
+templates.env.filters["human_datetime"] = _human_datetime
+
+_HOT_TEMPLATES = (
+    "team_member/dashboard.html",
+    "team_member/orders.html",
+    "team_member/plans.html",
+    "team_member/profile.html",
+    "team_member/_order_details.html",
+    "team_member/_otp_form.html",
+    "team_member/_plan_details.html",
+    "team_member/_attendance.html",
+)
+
+@lru_cache(maxsize=None)
+def _template(name: str) -> Template:
+    """Compiled template, looked up once per process"""
+    return templates.env.get_template(name)
+
+def _render(name: str, context: dict) -> HTMLResponse:
+    """Render a cached template straight to an HTML response"""
+    return HTMLResponse(_template(name).render(context))
+
+def _stream(name: str, context: dict) -> StreamingResponse:
+    """Render a cached template chunk by chunk as the client reads it"""
+    return StreamingResponse(_template(name).generate(context), media_type="text/html")
+
+# The dashboard layout with its content block swapped for a marker: the
+# <head> and navigation are flushed before the data query finishes, so the
+# browser fetches CSS/JS while the server waits on the database
+_STREAM_MARKER = "<!--stream-content-->"
+_DASHBOARD_SHELL = templates.env.from_string(
+    '{% extends "team_member/dashboard.html" %}'
+    '{% block content %}' + _STREAM_MARKER + '{% endblock %}'
+)
+
+# Pay the compile cost at import rather than on the first request
+for _name in _HOT_TEMPLATES:
+    try:
+        _template(_name)
+    except TemplateNotFound:
+        logger.warning(f"Template not found for preload: {_name}")
+
+# Fixed badge fragments, encoded once at import
+_READ_BADGE = b'<span class="badge bg-success">Read</span>'
+_ERROR_BADGE = b'<span class="badge bg-danger">Error</span>'
+
+# Delivery outcome fragments; order_id is an int path parameter, so the
+# one substitution needs no escaping
+_OTP_DELIVERED_HTML = string.Template("""
+    <div class="alert alert-success">
+        <i class="fas fa-check-circle"></i>
+        <strong>Delivery Successful!</strong><br>
+        Order #$order_id has been marked as delivered.
+    </div>
+    <script>
+        setTimeout(() => {
+            location.reload();
+        }, 2000);
+    </script>
+""")
+_OTP_INVALID_HTML = b"""
+    <div class="alert alert-danger">
+        <i class="fas fa-times-circle"></i>
+        <strong>Invalid OTP!</strong><br>
+        Please check the OTP and try again.
+    </div>
+"""
+_MARKED_DELIVERED_HTML = b"""
+    <div class="alert alert-success">
+        <i class="fas fa-check-circle"></i>
+        Order marked as delivered!
+    </div>
+    <script>
+        setTimeout(() => {
+            location.reload();
+        }, 1500);
+    </script>
+"""
+
+# Accepted status values and their badge colours
+_STATUS_BY_NAME: Mapping[str, OrderStatus] = MappingProxyType({s.value: s for s in OrderStatus})
+
+# Forward-only moves for orders in progress; other states are unrestricted
+_VALID_TRANSITIONS: Mapping[OrderStatus, FrozenSet[OrderStatus]] = MappingProxyType({
+    OrderStatus.CONFIRMED: frozenset({OrderStatus.PREPARING}),
+    OrderStatus.PREPARING: frozenset({OrderStatus.OUT_FOR_DELIVERY}),
+    OrderStatus.OUT_FOR_DELIVERY: frozenset({OrderStatus.DELIVERED})
+})
+
+# For each target status, the current statuses it may be reached from
+_ALLOWED_FROM: Mapping[OrderStatus, List[OrderStatus]] = MappingProxyType({
+    target: [
+        s for s in OrderStatus
+        if s != target and (s not in _VALID_TRANSITIONS or target in _VALID_TRANSITIONS[s])
+    ]
+    for target in OrderStatus
+})
+_STATUS_COLORS: Mapping[str, str] = MappingProxyType({
+    "pending": "warning",
+    "confirmed": "info",
+    "preparing": "primary",
+    "out_for_delivery": "success",
+    "delivered": "success",
+    "cancelled": "danger"
+})
+
+# Status badge fragments, built once per status
+_STATUS_BADGE_HTML: Mapping[str, str] = MappingProxyType({
+    value: f'<span class="badge bg-{color}">{value.replace("_", " ").title()}</span>'
+    for value, color in _STATUS_COLORS.items()
+})
+_UPDATED_BADGE = "<span class='badge bg-success ms-2'>Updated</span>"
+_DASHBOARD_ERROR_HTML = (
+    '<div class="alert alert-danger m-4">'
+    'Could not load your dashboard. Please refresh the page.</div>'
+)
+
+# user_id -> ((id, name, username), expires_at) for recently verified members
+_MEMBER_CACHE_SIZE = 10_000
+_MEMBER_CACHE_TTL = 30  # seconds
+_member_cache: "OrderedDict[int, Tuple[Row, float]]" = OrderedDict()
+
+async def get_current_team_member(request: Request):
+    """Get current team member (id, name, username) from session cookie
+    
+    The membership check runs on its own short-lived session so it never
+    holds a connection for the rest of the request.
+    """
+    identity = await get_cookie_identity(request)
+    if not identity:
         raise AuthenticationError("Not authenticated")
     
-    payload = verify_token(token)
-    if payload.get("role") != "team_member":
+    if identity.get("role") != "team_member":
         raise AuthenticationError("Access denied")
     
-    user = CRUDUser.get_by_id(db, payload.get("user_id"))
-    if not user or user.role != UserRole.TEAM_MEMBER:
+    # The session lookup above already enforces logout, so a short-lived
+    # per-user cache only skips re-checking that the account still exists
+    user_id = identity.get("user_id")
+    now = time.monotonic()
+    entry = _member_cache.get(user_id)
+    if entry is not None and entry[1] > now:
+        _member_cache.move_to_end(user_id)
+        return entry[0]
+    
+    member = await run_read(lambda s: CRUDUser.get_team_member_ref(s, user_id))
+    if member is None:
+        _member_cache.pop(user_id, None)
         raise AuthenticationError("Invalid team member")
     
-    return user
+    _member_cache[user_id] = (member, now + _MEMBER_CACHE_TTL)
+    if len(_member_cache) > _MEMBER_CACHE_SIZE:
+        _member_cache.popitem(last=False)
+    return member
 
 @router.get("/dashboard", response_class=HTMLResponse)
-async def team_member_dashboard(
-    request: Request,
-    db: AsyncSession = Depends(get_db)
-):
-    """Team member dashboard"""
+async def team_member_dashboard(request: Request):
+    """Team member dashboard
+    
+    The data query runs on its own session (see run_read) rather than the
+    request-scoped one, since it is still in flight while the response
+    streams. If it fails after the shell is sent, an error alert replaces
+    the content; if the client disconnects, the query is cancelled.
+    """
     try:
-        team_member = await get_current_team_member(request, db)
-        
-        # Get assigned orders
-        orders = await CRUDOrder.get_team_member_orders(db, team_member.id)
-        
-        # Get unread plans
-        plans = await CRUDTeamMemberPlan.get_team_member_plans(db, team_member.id)
-        unread_plans = [p for p in plans if not p.is_read]
-        
-        # Get today's session
-        from datetime import date
-        sessions = await CRUDUser.get_user_sessions(db, team_member.id, start_date=date.today())
-        
-        return templates.TemplateResponse("team_member/dashboard.html", {
-            "request": request,
-            "team_member": team_member,
-            "orders": orders,
-            "unread_plans": unread_plans[:5],  # Show only 5 latest
-            "total_plans": len(plans),
-            "today_sessions": len(sessions)
-        })
+        team_member = await get_current_team_member(request)
     except AuthenticationError:
         return RedirectResponse(url="/auth/login?role=team_member", status_code=303)
+    
+    # Orders, unread plans and counts arrive together, started now so
+    # they load while the page shell is sent
+    today = date.today()
+    bundle_task = asyncio.create_task(
+        run_read(lambda s: CRUDUser.dashboard_bundle(s, team_member.id, today))
+    )
+    
+    async def render():
+        try:
+            head, tail = _DASHBOARD_SHELL.render({"request": request}).split(_STREAM_MARKER, 1)
+            yield head
+            
+            try:
+                bundle = await bundle_task
+            except Exception:
+                logger.exception(f"Dashboard load failed for team member {team_member.id}")
+                yield _DASHBOARD_ERROR_HTML
+            else:
+                template = _template("team_member/dashboard.html")
+                context = template.new_context({
+                    "request": request,
+                    "team_member": team_member,
+                    "orders": bundle["orders"],
+                    "unread_plans": bundle["unread_plans"],
+                    "unread_count": bundle["unread_count"],
+                    "total_plans": bundle["plan_total"],
+                    "today_sessions": bundle["session_count"],
+                    "today": today
+                })
+                yield "".join(template.blocks["content"](context))
+            yield tail
+        finally:
+            # Client went away before the bundle was consumed
+            if not bundle_task.done():
+                bundle_task.cancel()
+    
+    return StreamingResponse(render(), media_type="text/html")
 
 @router.get("/orders", response_class=HTMLResponse)
 async def team_member_orders(
@@ -78,10 +262,10 @@ async def team_member_orders(
 ):
     """View assigned orders"""
     try:
-        team_member = await get_current_team_member(request, db)
+        team_member = await get_current_team_member(request)
         orders = await CRUDOrder.get_team_member_orders(db, team_member.id)
         
-        return templates.TemplateResponse("team_member/orders.html", {
+        return _render("team_member/orders.html", {
             "request": request,
             "team_member": team_member,
             "orders": orders
@@ -90,224 +274,93 @@ async def team_member_orders(
         return RedirectResponse(url="/auth/login?role=team_member", status_code=303)
 
 @router.get("/order/{order_id}/details")
+@htmx_safe
 async def order_details_for_delivery(
     request: Request,
     order_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     """Get order details for delivery"""
-    try:
-        team_member = await get_current_team_member(request, db)
-        order = await CRUDOrder.get_by_id(db, order_id, with_items=True)
-        
-        if not order or order.assigned_to != team_member.id:
-            raise NotFoundError("Order")
-        
-        # HTMX response for modal
-        items_html = ""
-        for item in order.order_items:
-            items_html += f"""
-            <tr>
-                <td>{item.item_name}</td>
-                <td>{item.quantity}</td>
-                <td>₹{item.unit_price:.2f}</td>
-                <td>₹{item.subtotal:.2f}</td>
-            </tr>
-            """
-        
-        # Customer info
-        customer_html = f"""
-        <div class="mb-3">
-            <h6>Customer Information</h6>
-            <p><strong>Name:</strong> {order.customer.name}</p>
-            <p><strong>Phone:</strong> {order.customer.phone}</p>
-            <p><strong>Address:</strong> {order.address}</p>
-            {f'<p><strong>Instructions:</strong> {order.special_instructions}</p>' if order.special_instructions else ''}
-        </div>
-        """
-        
-        return HTMLResponse(f"""
-            <div class="modal-content">
-                <div class="modal-header">
-                    <h5 class="modal-title">Order #{order.id} - Delivery Details</h5>
-                    <button type="button" class="btn-close" data-bs-dismiss="modal"></button>
-                </div>
-                <div class="modal-body">
-                    <div class="row mb-3">
-                        <div class="col-6">
-                            <strong>Status:</strong>
-                            <span class="badge bg-{'info' if order.status == 'pending' else 'warning' if order.status == 'preparing' else 'success' if order.status == 'out_for_delivery' else 'danger'}">
-                                {order.status.replace('_', ' ').title()}
-                            </span>
-                        </div>
-                        <div class="col-6">
-                            <strong>Total:</strong> ₹{order.total_amount:.2f}
-                        </div>
-                    </div>
-                    
-                    {customer_html}
-                    
-                    <div class="mb-3">
-                        <h6>Order Items</h6>
-                        <div class="table-responsive">
-                            <table class="table table-sm">
-                                <thead>
-                                    <tr>
-                                        <th>Item</th>
-                                        <th>Qty</th>
-                                        <th>Price</th>
-                                        <th>Subtotal</th>
-                                    </tr>
-                                </thead>
-                                <tbody>
-                                    {items_html}
-                                </tbody>
-                                <tfoot>
-                                    <tr>
-                                        <td colspan="3" class="text-end"><strong>Total:</strong></td>
-                                        <td><strong>₹{order.total_amount:.2f}</strong></td>
-                                    </tr>
-                                </tfoot>
-                            </table>
-                        </div>
-                    </div>
-                    
-                    <div class="text-muted small">
-                        Ordered: {order.created_at.strftime('%d %b %Y, %I:%M %p')}
-                        {f'<br>Confirmed: {order.confirmed_at.strftime("%d %b %Y, %I:%M %p")}' if order.confirmed_at else ''}
-                        {f'<br>Prepared: {order.prepared_at.strftime("%d %b %Y, %I:%M %p")}' if order.prepared_at else ''}
-                    </div>
-                </div>
-                <div class="modal-footer">
-                    <button type="button" class="btn btn-secondary" data-bs-dismiss="modal">Close</button>
-                    
-                    {f'<button type="button" class="btn btn-primary" hx-post="/team/order/{order.id}/generate-otp" hx-target="#otp-section">Generate OTP</button>' if order.status == OrderStatus.OUT_FOR_DELIVERY else ''}
-                    
-                    {f'<button type="button" class="btn btn-success" hx-post="/team/order/{order.id}/mark-delivered" hx-confirm="Mark as delivered?">Mark as Delivered</button>' if order.status == OrderStatus.OUT_FOR_DELIVERY else ''}
-                </div>
-            </div>
-        """)
-        
-    except Exception as e:
-        return HTMLResponse(f"""
-            <div class="alert alert-danger">{str(e)}</div>
-        """)
+    team_member = await get_current_team_member(request)
+    order = await CRUDOrder.get_by_id(db, order_id, with_items=True)
+    
+    if not order or order.assigned_to != team_member.id:
+        raise NotFoundError("Order")
+    
+    # HTMX response for modal
+    return _render("team_member/_order_details.html", {
+        "order": order,
+        "status_color": _STATUS_COLORS.get(getattr(order.status, "value", order.status), "secondary")
+    })
 
 @router.post("/order/{order_id}/status")
 async def update_order_status_team(
     request: Request,
     order_id: int,
-    status: str = Form(...),
+    status_value: str = Form(..., alias="status"),
     db: AsyncSession = Depends(get_db)
 ):
     """Update order status (team member)"""
     try:
-        team_member = await get_current_team_member(request, db)
-        order = await CRUDOrder.get_by_id(db, order_id)
-        
-        if not order or order.assigned_to != team_member.id:
-            raise NotFoundError("Order")
-        
-        # Validate status transition
-        valid_transitions = {
-            OrderStatus.CONFIRMED: [OrderStatus.PREPARING],
-            OrderStatus.PREPARING: [OrderStatus.OUT_FOR_DELIVERY],
-            OrderStatus.OUT_FOR_DELIVERY: [OrderStatus.DELIVERED]
-        }
-        
-        current_status = order.status
-        new_status = OrderStatus(status)
-        
-        if (current_status in valid_transitions and 
-            new_status not in valid_transitions[current_status]):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot change status from {current_status} to {new_status}"
-            )
-        
-        # Update status
-        order.update_status(new_status)
-        await db.commit()
-        
-        # Get status badge color
-        status_colors = {
-            "pending": "warning",
-            "confirmed": "info",
-            "preparing": "primary",
-            "out_for_delivery": "success",
-            "delivered": "success",
-            "cancelled": "danger"
-        }
+        team_member = await get_current_team_member(request)
+        
+        # Validate status
+        new_status = _STATUS_BY_NAME.get(status_value)
+        if new_status is None:
+            raise ValidationError(f"Invalid status: {status_value}")
+        
+        # Ownership check, transition check and write in one statement
+        updated = await CRUDOrder.authorize_and_update_status(
+            db, order_id, team_member.id, new_status, _ALLOWED_FROM[new_status]
+        )
+        if updated is None:
+            # Only the failure path pays for a second query, to explain itself
+            order = await CRUDOrder.get_minimal(db, order_id)
+            if not order or order.assigned_to != team_member.id:
+                raise NotFoundError("Order")
+            if order.status != new_status:
+                raise ValidationError(f"Cannot change status from {order.status} to {new_status}")
+        else:
+            await db.commit()
         
         # HTMX response
-        return HTMLResponse(f"""
-            <span class="badge bg-{status_colors.get(status, 'secondary')}">
-                {status.replace('_', ' ').title()}
-            </span>
-            {"<span class='badge bg-success ms-2'>Updated</span>" if status != current_status else ""}
-        """)
+        return HTMLResponse(
+            _STATUS_BADGE_HTML[status_value] + (_UPDATED_BADGE if updated is not None else "")
+        )
         
     except Exception as e:
         return HTMLResponse(f"""
             <span class="badge bg-danger">Error</span>
-            <div class="alert alert-danger mt-2">{str(e)}</div>
+            <div class="alert alert-danger mt-2">{escape(str(e))}</div>
         """)
 
 @router.post("/order/{order_id}/generate-otp")
+@htmx_safe
 async def generate_otp_for_delivery(
     request: Request,
     order_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     """Generate OTP for order delivery"""
-    try:
-        team_member = await get_current_team_member(request, db)
-        
-        # Generate OTP
-        otp = await CRUDOrder.generate_otp_for_delivery(db, order_id)
-        
-        # Get order and customer
-        order = await CRUDOrder.get_by_id(db, order_id, with_items=True)
-        
-        # Send SMS to customer
-        if order and order.customer:
-            message = f"Your Bite Me Buddy order #{order_id} is out for delivery. OTP: {otp}. Valid for 5 minutes."
-            # await send_sms(order.customer.phone, message)  # Uncomment when Twilio is configured
-        
-        # HTMX response with OTP form
-        return HTMLResponse(f"""
-            <div id="otp-section" class="mt-3 p-3 border rounded">
-                <h6>Delivery OTP Generated</h6>
-                <div class="alert alert-info">
-                    <strong>OTP: {otp}</strong><br>
-                    Sent to customer: {order.customer.phone if order and order.customer else 'N/A'}<br>
-                    Valid for 5 minutes
-                </div>
-                
-                <form hx-post="/team/order/{order_id}/verify-otp" 
-                      hx-target="#delivery-result"
-                      class="mt-2">
-                    <div class="mb-3">
-                        <label class="form-label">Enter OTP from Customer</label>
-                        <input type="text" class="form-control" name="otp" 
-                               maxlength="4" pattern="\\d{{4}}" required 
-                               placeholder="Enter 4-digit OTP">
-                    </div>
-                    <button type="submit" class="btn btn-success w-100">
-                        Verify OTP & Complete Delivery
-                    </button>
-                </form>
-                
-                <div id="delivery-result"></div>
-            </div>
-        """)
-        
-    except Exception as e:
-        return HTMLResponse(f"""
-            <div class="alert alert-danger">{str(e)}</div>
-        """)
+    team_member = await get_current_team_member(request)
+    
+    # Generate OTP; the customer's phone comes back from the same UPDATE
+    otp, phone = await CRUDOrder.generate_otp_for_delivery(db, order_id, team_member.id)
+    
+    # Send SMS to customer
+    if phone:
+        message = f"Your Bite Me Buddy order #{order_id} is out for delivery. OTP: {otp}. Valid for 5 minutes."
+        # await send_sms(phone, message)  # Uncomment when Twilio is configured
+    
+    # HTMX response with OTP form
+    return _render("team_member/_otp_form.html", {
+        "otp": otp,
+        "phone": phone,
+        "order_id": order_id
+    })
 
 @router.post("/order/{order_id}/verify-otp")
+@htmx_safe
 async def verify_otp_for_delivery(
     request: Request,
     order_id: int,
@@ -315,90 +368,45 @@ async def verify_otp_for_delivery(
     db: AsyncSession = Depends(get_db)
 ):
     """Verify OTP for order delivery"""
-    try:
-        team_member = await get_current_team_member(request, db)
-        
-        # Verify OTP
-        success = await CRUDOrder.verify_otp(db, order_id, otp)
-        
-        if success:
-            # Update order status to delivered
-            order = await CRUDOrder.get_by_id(db, order_id)
-            order.update_status(OrderStatus.DELIVERED)
-            await db.commit()
-            
-            return HTMLResponse(f"""
-                <div class="alert alert-success">
-                    <i class="fas fa-check-circle"></i>
-                    <strong>Delivery Successful!</strong><br>
-                    Order #{order_id} has been marked as delivered.
-                </div>
-                <script>
-                    setTimeout(() => {{
-                        location.reload();
-                    }}, 2000);
-                </script>
-            """)
-        else:
-            return HTMLResponse(f"""
-                <div class="alert alert-danger">
-                    <i class="fas fa-times-circle"></i>
-                    <strong>Invalid OTP!</strong><br>
-                    Please check the OTP and try again.
-                </div>
-            """)
-        
-    except Exception as e:
-        return HTMLResponse(f"""
-            <div class="alert alert-danger">{str(e)}</div>
-        """)
+    team_member = await get_current_team_member(request)
+    
+    # Verify OTP
+    success = await CRUDOrder.verify_otp(db, order_id, otp)
+    
+    if success:
+        # verify_otp has already marked the order delivered and committed
+        return HTMLResponse(_OTP_DELIVERED_HTML.substitute(order_id=order_id))
+    else:
+        return Response(_OTP_INVALID_HTML, media_type="text/html")
 
 @router.post("/order/{order_id}/mark-delivered")
+@htmx_safe
 async def mark_order_delivered(
     request: Request,
     order_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     """Mark order as delivered (without OTP verification)"""
-    try:
-        team_member = await get_current_team_member(request, db)
-        order = await CRUDOrder.get_by_id(db, order_id)
-        
-        if not order or order.assigned_to != team_member.id:
-            raise NotFoundError("Order")
-        
-        # Mark as delivered
-        order.update_status(OrderStatus.DELIVERED)
-        await db.commit()
-        
-        return HTMLResponse(f"""
-            <div class="alert alert-success">
-                <i class="fas fa-check-circle"></i>
-                Order marked as delivered!
-            </div>
-            <script>
-                setTimeout(() => {{
-                    location.reload();
-                }}, 1500);
-            </script>
-        """)
-        
-    except Exception as e:
-        return HTMLResponse(f"""
-            <div class="alert alert-danger">{str(e)}</div>
-        """)
+    team_member = await get_current_team_member(request)
+    
+    # Mark as delivered; no row means missing or assigned to someone else
+    if await CRUDOrder.authorize_and_update_status(
+        db, order_id, team_member.id, OrderStatus.DELIVERED
+    ) is None:
+        raise NotFoundError("Order")
+    await db.commit()
+    
+    return Response(_MARKED_DELIVERED_HTML, media_type="text/html")
 
 @router.get("/plans", response_class=HTMLResponse)
-async def view_plans(
-    request: Request,
-    db: AsyncSession = Depends(get_db)
-):
+async def view_plans(request: Request):
     """View team member plans"""
     try:
-        team_member = await get_current_team_member(request, db)
-        plans = await CRUDTeamMemberPlan.get_team_member_plans(db, team_member.id)
+        team_member = await get_current_team_member(request)
+        # Release the connection before rendering
+        plans = await run_read(lambda s: CRUDTeamMemberPlan.get_team_member_plans(s, team_member.id))
         
-        return templates.TemplateResponse("team_member/plans.html", {
+        return _render("team_member/plans.html", {
             "request": request,
             "team_member": team_member,
             "plans": plans
@@ -407,59 +415,38 @@ async def view_plans(
         return RedirectResponse(url="/auth/login?role=team_member", status_code=303)
 
 @router.get("/plan/{plan_id}")
+@htmx_safe
 async def view_plan_details(
     request: Request,
     plan_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     """View plan details"""
-    try:
-        team_member = await get_current_team_member(request, db)
-        plan = await CRUDTeamMemberPlan.get_by_id(db, plan_id)
-        
-        if not plan or plan.team_member_id != team_member.id:
-            raise NotFoundError("Plan")
-        
-        # Mark as read
-        await CRUDTeamMemberPlan.mark_as_read(db, plan_id, team_member.id)
-        
-        # HTMX response for modal
-        return HTMLResponse(f"""
-            <div class="modal-content">
-                <div class="modal-header">
-                    <h5 class="modal-title">Plan from Admin</h5>
-                    <button type="button" class="btn-close" data-bs-dismiss="modal"></button>
-                </div>
-                <div class="modal-body">
-                    <div class="mb-3">
-                        <p><strong>From:</strong> {plan.admin.name}</p>
-                        <p><strong>Date:</strong> {plan.created_at.strftime('%d %b %Y, %I:%M %p')}</p>
-                    </div>
-                    
-                    <div class="mb-3">
-                        <h6>Plan Details</h6>
-                        <div class="p-3 bg-light rounded">
-                            {plan.description.replace('\\n', '<br>')}
-                        </div>
-                    </div>
-                    
-                    {f'''
-                    <div class="mb-3">
-                        <h6>Attachment</h6>
-                        <img src="{plan.image_url}" class="img-fluid rounded" alt="Plan Image">
-                    </div>
-                    ''' if plan.image_url else ''}
-                </div>
-                <div class="modal-footer">
-                    <button type="button" class="btn btn-secondary" data-bs-dismiss="modal">Close</button>
-                </div>
-            </div>
-        """)
-        
-    except Exception as e:
-        return HTMLResponse(f"""
-            <div class="alert alert-danger">{str(e)}</div>
-        """)
+    team_member = await get_current_team_member(request)
+    ref = await CRUDTeamMemberPlan.get_plan_ref(db, plan_id)
+    
+    if not ref or ref.team_member_id != team_member.id:
+        raise NotFoundError("Plan")
+    
+    # Plans are never edited after creation, so id + creation time identify
+    # the rendered modal. Checked before the full read and the read-flag
+    # write so a reopened, already-read plan costs one narrow query
+    cache_headers = {
+        "ETag": f'W/"plan-{ref.id}-{int(ref.created_at.timestamp())}"',
+        "Cache-Control": "private, no-cache"
+    }
+    if ref.is_read and request.headers.get("if-none-match") == cache_headers["ETag"]:
+        return Response(status_code=304, headers=cache_headers)
+    
+    # Only the first open writes; later opens skip the UPDATE entirely
+    if not ref.is_read:
+        await CRUDTeamMemberPlan.mark_read_once(db, plan_id, team_member.id)
+    plan = await CRUDTeamMemberPlan.get_by_id(db, plan_id, with_admin=True)
+    
+    # HTMX response for modal
+    response = _render("team_member/_plan_details.html", {"plan": plan})
+    response.headers.update(cache_headers)
+    return response
 
 @router.post("/plan/{plan_id}/mark-read")
 async def mark_plan_as_read(
@@ -469,63 +456,43 @@ async def mark_plan_as_read(
 ):
     """Mark plan as read"""
     try:
-        team_member = await get_current_team_member(request, db)
+        team_member = await get_current_team_member(request)
         plan = await CRUDTeamMemberPlan.mark_as_read(db, plan_id, team_member.id)
         
-        if plan:
-            return HTMLResponse(f"""
-                <span class="badge bg-success">Read</span>
-            """)
-        else:
-            return HTMLResponse(f"""
-                <span class="badge bg-danger">Error</span>
-            """)
+        return Response(_READ_BADGE if plan else _ERROR_BADGE, media_type="text/html")
         
-    except Exception as e:
-        return HTMLResponse(f"""
-            <span class="badge bg-danger">Error</span>
-        """)
+    except Exception:
+        return Response(_ERROR_BADGE, media_type="text/html")
 
 @router.get("/profile", response_class=HTMLResponse)
-async def team_member_profile(
-    request: Request,
-    db: AsyncSession = Depends(get_db)
-):
+async def team_member_profile(request: Request):
     """Team member profile"""
     try:
-        team_member = await get_current_team_member(request, db)
-        
-        # Get session statistics
-        sessions = await CRUDUser.get_user_sessions(db, team_member.id)
-        
-        # Get assigned orders statistics
-        orders = await CRUDOrder.get_team_member_orders(db, team_member.id)
-        delivered_orders = [o for o in orders if o.status == OrderStatus.DELIVERED]
+        member = await get_current_team_member(request)
         
-        # Get plans statistics
-        plans = await CRUDTeamMemberPlan.get_team_member_plans(db, team_member.id)
-        read_plans = [p for p in plans if p.is_read]
+        # The profile shows the full account; counts and sums are computed
+        # in the database, concurrently
+        team_member, session_stats, counts = await gather_reads(
+            lambda s: CRUDUser.get_by_id(s, member.id),
+            lambda s: CRUDUser.get_session_stats(s, member.id),
+            lambda s: CRUDUser.get_team_member_counts(s, member.id)
+        )
         
-        # Calculate total online time
-        total_minutes = 0
-        for session in sessions:
-            if session.duration_minutes:
-                total_minutes += session.duration_minutes
-        
-        return templates.TemplateResponse("team_member/profile.html", {
+        return _render("team_member/profile.html", {
             "request": request,
             "team_member": team_member,
-            "sessions": len(sessions),
-            "total_minutes": round(total_minutes, 2),
-            "total_orders": len(orders),
-            "delivered_orders": len(delivered_orders),
-            "total_plans": len(plans),
-            "read_plans": len(read_plans)
+            "sessions": session_stats["session_count"],
+            "total_minutes": session_stats["total_minutes"],
+            "total_orders": counts["total_orders"],
+            "delivered_orders": counts["delivered_orders"],
+            "total_plans": counts["total_plans"],
+            "read_plans": counts["read_plans"]
         })
     except AuthenticationError:
         return RedirectResponse(url="/auth/login?role=team_member", status_code=303)
 
 @router.get("/attendance")
+@htmx_safe
 async def attendance_report(
     request: Request,
     start_date: Optional[str] = None,
@@ -533,113 +500,37 @@ async def attendance_report(
     db: AsyncSession = Depends(get_db)
 ):
     """Get attendance report"""
-    try:
-        team_member = await get_current_team_member(request, db)
-        
-        # Parse dates
-        from datetime import datetime
-        start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
-        end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None
-        
-        # Get sessions
-        sessions = await CRUDUser.get_user_sessions(db, team_member.id, start, end)
-        
-        # Calculate statistics
-        total_sessions = len(sessions)
-        total_minutes = 0
-        sessions_by_date = {}
-        
-        for session in sessions:
-            date_str = session.date.strftime("%Y-%m-%d")
-            if date_str not in sessions_by_date:
-                sessions_by_date[date_str] = []
-            sessions_by_date[date_str].append(session)
-            
-            if session.duration_minutes:
-                total_minutes += session.duration_minutes
-        
-        # HTMX response
-        rows_html = ""
-        for date_str, date_sessions in sorted(sessions_by_date.items(), reverse=True):
-            date_minutes = sum(s.duration_minutes or 0 for s in date_sessions)
-            first_login = min(s.login_time for s in date_sessions).strftime("%I:%M %p")
-            last_logout = max(s.logout_time for s in date_sessions if s.logout_time)
-            last_logout_str = last_logout.strftime("%I:%M %p") if last_logout else "Still online"
-            
-            rows_html += f"""
-            <tr>
-                <td>{date_str}</td>
-                <td>{len(date_sessions)}</td>
-                <td>{first_login}</td>
-                <td>{last_logout_str}</td>
-                <td>{round(date_minutes, 2)} minutes</td>
-                <td>{round(date_minutes / 60, 2) if date_minutes > 0 else 0} hours</td>
-            </tr>
-            """
-        
-        return HTMLResponse(f"""
-            <div class="card">
-                <div class="card-header">
-                    <h5 class="mb-0">Attendance Report</h5>
-                </div>
-                <div class="card-body">
-                    <div class="row mb-4">
-                        <div class="col-md-3">
-                            <div class="card bg-light">
-                                <div class="card-body text-center">
-                                    <h6 class="card-title">Total Sessions</h6>
-                                    <h3>{total_sessions}</h3>
-                                </div>
-                            </div>
-                        </div>
-                        <div class="col-md-3">
-                            <div class="card bg-light">
-                                <div class="card-body text-center">
-                                    <h6 class="card-title">Total Time</h6>
-                                    <h3>{round(total_minutes / 60, 2)} hrs</h3>
-                                </div>
-                            </div>
-                        </div>
-                        <div class="col-md-3">
-                            <div class="card bg-light">
-                                <div class="card-body text-center">
-                                    <h6 class="card-title">Average Session</h6>
-                                    <h3>{round(total_minutes / total_sessions, 2) if total_sessions > 0 else 0} min</h3>
-                                </div>
-                            </div>
-                        </div>
-                        <div class="col-md-3">
-                            <div class="card bg-light">
-                                <div class="card-body text-center">
-                                    <h6 class="card-title">Days Active</h6>
-                                    <h3>{len(sessions_by_date)}</h3>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div class="table-responsive">
-                        <table class="table table-hover">
-                            <thead>
-                                <tr>
-                                    <th>Date</th>
-                                    <th>Sessions</th>
-                                    <th>First Login</th>
-                                    <th>Last Logout</th>
-                                    <th>Total Minutes</th>
-                                    <th>Total Hours</th>
-                                </tr>
-                            </thead>
-                            <tbody>
-                                {rows_html if rows_html else '<tr><td colspan="6" class="text-center">No data found</td></tr>'}
-                            </tbody>
-                        </table>
-                    </div>
-                </div>
-            </div>
-        """)
-        
-    except Exception as e:
-        return HTMLResponse(f"""
-            <div class="alert alert-danger">{str(e)}</div>
-        """)
+    team_member = await get_current_team_member(request)
+    
+    # Parse dates
+    start = datetime.strptime(start_date, _DATE_FMT).date() if start_date else None
+    end = datetime.strptime(end_date, _DATE_FMT).date() if end_date else None
+    
+    # One row per day, aggregated in the database
+    days = await CRUDUser.get_attendance_summary(db, team_member.id, start, end)
+    
+    # Report totals follow from the day rows
+    total_sessions = sum(day.sessions for day in days)
+    total_minutes = float(sum(day.minutes for day in days))
+    
+    # (date, sessions, first login, last logout, minutes, hours), formatted
+    # lazily as the template streams each row out
+    rows = (
+        (
+            day.date.strftime(_DATE_FMT),
+            day.sessions,
+            day.first_login.strftime(_TIME_FMT),
+            day.last_logout.strftime(_TIME_FMT) if day.last_logout else "Still online",
+            round(float(day.minutes), 2),
+            round(float(day.minutes) / 60, 2) if day.minutes > 0 else 0
+        )
+        for day in days
+    )
+    
+    # HTMX response
+    return _stream("team_member/_attendance.html", {
+        "rows": rows,
+        "total_sessions": total_sessions,
+        "total_minutes": total_minutes,
+        "days_active": len(days)
+    })
@@ -3,13 +3,13 @@ Users router for Bite Me Buddy
 """
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from database import get_db
 from models import User
-from schemas import UserResponse, UserUpdate, UserWithSessions
+from schemas import UserResponse, UserSessionResponse, UserUpdate, UserWithSessions
 from crud import (
     get_user_by_id, update_user, delete_user, get_all_users,
     get_users_by_role, get_user_sessions, get_user_online_stats
@@ -49,14 +49,15 @@ async def read_user(
     # Get user sessions
     sessions = await get_user_sessions(db, user_id)
     
-    # Create response
+    # Create response, serialized straight to JSON bytes by pydantic-core
     user_data = UserResponse.model_validate(user)
     sessions_data = [UserSessionResponse.model_validate(s) for s in sessions]
     
-    return UserWithSessions(
-        **user_data.model_dump(),
+    body = UserWithSessions(
+        **dict(user_data),
         sessions=sessions_data
-    )
+    ).model_dump_json()
+    return Response(content=body, media_type="application/json")
 
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user_info(
@@ -1,51 +1,96 @@
 """
 Pydantic schemas package initialization
+
+Submodules are imported on first attribute access (PEP 562), so a process
+only builds the models its routers actually import.
 """
 
-from schemas.user import *
-from schemas.auth import *
-from schemas.service import *
-from schemas.menu_item import *
-from schemas.order import *
-from schemas.team_member_plan import *
-from schemas.user_session import *
+import importlib
+
+_EXPORTS = {
+    # Enums
+    "schemas.enums": (
+        "UserRole",
+        "OrderStatus",
+    ),
 
-__all__ = [
     # User schemas
-    "UserCreate",
-    "UserUpdate",
-    "UserResponse",
-    "CustomerCreate",
-    "TeamMemberCreate",
-    "AdminCreate",
-    
+    "schemas.user": (
+        "UserCreate",
+        "UserUpdate",
+        "UserResponse",
+        "CustomerCreate",
+        "TeamMemberCreate",
+        "AdminCreate",
+        "UserWithSessions",
+    ),
+
     # Auth schemas
-    "LoginRequest",
-    "Token",
-    "TokenData",
-    
+    "schemas.auth": (
+        "LoginRequest",
+        "UserLogin",
+        "Token",
+        "TokenData",
+        "OTPVerifyRequest",
+        "OTPVerify",
+        "OTPResponse",
+    ),
+
     # Service schemas
-    "ServiceCreate",
-    "ServiceUpdate",
-    "ServiceResponse",
-    
+    "schemas.service": (
+        "ServiceCreate",
+        "ServiceUpdate",
+        "ServiceResponse",
+        "ServiceSummaryResponse",
+    ),
+
     # Menu item schemas
-    "MenuItemCreate",
-    "MenuItemUpdate",
-    "MenuItemResponse",
-    
+    "schemas.menu_item": (
+        "MenuItemCreate",
+        "MenuItemUpdate",
+        "MenuItemResponse",
+        "MenuItemListAdapter",
+    ),
+
     # Order schemas
-    "OrderCreate",
-    "OrderUpdate",
-    "OrderResponse",
-    "OrderItemCreate",
-    "OrderItemResponse",
-    
+    "schemas.order": (
+        "OrderCreate",
+        "OrderUpdate",
+        "OrderResponse",
+        "OrderItemCreate",
+        "OrderItemResponse",
+        "OrderListAdapter",
+        "OrderItemListAdapter",
+    ),
+
     # Team member plan schemas
-    "TeamMemberPlanCreate",
-    "TeamMemberPlanResponse",
-    
+    "schemas.team_member_plan": (
+        "TeamMemberPlanCreate",
+        "TeamMemberPlanResponse",
+    ),
+
     # User session schemas
-    "UserSessionCreate",
-    "UserSessionResponse",
-]
+    "schemas.user_session": (
+        "UserSessionCreate",
+        "UserSessionResponse",
+        "UserSessionListAdapter",
+        "UserOnlineStats",
+    ),
+}
+
+# name -> defining module
+_LAZY = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_LAZY)
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
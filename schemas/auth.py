@@ -2,16 +2,25 @@
 Authentication related schemas
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, Optional
 from datetime import datetime
 
+# One alias per pattern so pydantic-core compiles the regex once; length
+# limits stay on each field
+OTPDigits = Annotated[str, StringConstraints(strip_whitespace=True, pattern=r'^\d+$')]
+
 class LoginRequest(BaseModel):
     """Schema for login request"""
     username: str = Field(..., min_length=3, max_length=50)
     password: str = Field(..., min_length=8, max_length=50)
     role: Optional[str] = None
 
+class UserLogin(BaseModel):
+    """Schema for JSON login"""
+    username: str
+    password: str
+
 class Token(BaseModel):
     """Schema for token response"""
     access_token: str
@@ -31,4 +40,15 @@ class TokenData(BaseModel):
 class OTPVerifyRequest(BaseModel):
     """Schema for OTP verification"""
     order_id: int
-    otp: str = Field(..., min_length=4, max_length=4)
+    otp: OTPDigits = Field(..., min_length=4, max_length=4)
+
+class OTPVerify(BaseModel):
+    """Schema for delivery OTP verification"""
+    order_id: int
+    otp: OTPDigits = Field(..., min_length=4, max_length=6)
+
+class OTPResponse(BaseModel):
+    """Schema for OTP generation response"""
+    message: str
+    order_id: int
+    expires_at: Optional[datetime] = None
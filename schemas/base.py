@@ -0,0 +1,32 @@
+"""
+Shared helpers for Pydantic schemas
+"""
+
+from typing import Any, Dict, Tuple
+
+from pydantic.json_schema import DEFAULT_REF_TEMPLATE, GenerateJsonSchema, JsonSchemaMode
+
+# (model, by_alias, ref_template, generator, mode) -> generated JSON schema
+_json_schema_cache: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+class CachedJsonSchema:
+    """Mixin that generates a model's JSON schema once per set of arguments
+    
+    List it before the pydantic base class. The returned dict is shared
+    between callers and must not be mutated.
+    """
+    
+    @classmethod
+    def model_json_schema(
+        cls,
+        by_alias: bool = True,
+        ref_template: str = DEFAULT_REF_TEMPLATE,
+        schema_generator: type[GenerateJsonSchema] = GenerateJsonSchema,
+        mode: JsonSchemaMode = 'validation'
+    ) -> Dict[str, Any]:
+        key = (cls, by_alias, ref_template, schema_generator, mode)
+        schema = _json_schema_cache.get(key)
+        if schema is None:
+            schema = super().model_json_schema(by_alias, ref_template, schema_generator, mode)
+            _json_schema_cache[key] = schema
+        return schema
@@ -0,0 +1,20 @@
+"""
+Enumerations shared by the Pydantic schemas
+"""
+
+from enum import Enum
+
+class UserRole(str, Enum):
+    """User role enumeration for schemas"""
+    CUSTOMER = "customer"
+    TEAM_MEMBER = "team_member"
+    ADMIN = "admin"
+
+class OrderStatus(str, Enum):
+    """Order status enumeration"""
+    PENDING = "pending"
+    CONFIRMED = "confirmed"
+    PREPARING = "preparing"
+    OUT_FOR_DELIVERY = "out_for_delivery"
+    DELIVERED = "delivered"
+    CANCELLED = "cancelled"
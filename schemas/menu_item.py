@@ -2,10 +2,12 @@
 Pydantic schemas for MenuItem model
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, Field, TypeAdapter, validator
+from typing import List, Optional
 from datetime import datetime
 
+from schemas.base import CachedJsonSchema
+
 class MenuItemBase(BaseModel):
     """Base menu item schema"""
     name: str = Field(..., min_length=2, max_length=100)
@@ -14,13 +16,13 @@ class MenuItemBase(BaseModel):
     
     @validator('price')
     def validate_price(cls, v):
-        """Validate price"""
-        if v <= 0:
-            raise ValueError('Price must be greater than 0')
+        """Round price to paise; gt=0 has already been enforced"""
         return round(v, 2)
     
     class Config:
         from_attributes = True
+        # Only the subclasses are used, so skip building this one
+        defer_build = True
 
 class MenuItemCreate(MenuItemBase):
     """Schema for creating a menu item"""
@@ -36,14 +38,10 @@ class MenuItemUpdate(BaseModel):
     
     @validator('price')
     def validate_price(cls, v):
-        """Validate price if provided"""
-        if v is not None:
-            if v <= 0:
-                raise ValueError('Price must be greater than 0')
-            return round(v, 2)
-        return v
+        """Round price if provided; gt=0 has already been enforced"""
+        return round(v, 2) if v is not None else v
 
-class MenuItemResponse(MenuItemBase):
+class MenuItemResponse(CachedJsonSchema, MenuItemBase):
     """Schema for menu item response"""
     id: int
     service_id: int
@@ -54,3 +52,6 @@ class MenuItemResponse(MenuItemBase):
     
     class Config:
         from_attributes = True
+        frozen = True
+
+MenuItemListAdapter = TypeAdapter(List[MenuItemResponse])
@@ -2,19 +2,12 @@
 Pydantic schemas for Order model
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, TypeAdapter, validator
 from typing import List, Optional
 from datetime import datetime
-from enum import Enum
 
-class OrderStatus(str, Enum):
-    """Order status enumeration"""
-    PENDING = "pending"
-    CONFIRMED = "confirmed"
-    PREPARING = "preparing"
-    OUT_FOR_DELIVERY = "out_for_delivery"
-    DELIVERED = "delivered"
-    CANCELLED = "cancelled"
+from schemas.base import CachedJsonSchema
+from schemas.enums import OrderStatus
 
 class OrderItemBase(BaseModel):
     """Base order item schema"""
@@ -23,12 +16,13 @@ class OrderItemBase(BaseModel):
     
     class Config:
         from_attributes = True
+        defer_build = True
 
 class OrderItemCreate(OrderItemBase):
     """Schema for creating an order item"""
     pass
 
-class OrderItemResponse(OrderItemBase):
+class OrderItemResponse(CachedJsonSchema, OrderItemBase):
     """Schema for order item response"""
     id: int
     order_id: int
@@ -39,6 +33,7 @@ class OrderItemResponse(OrderItemBase):
     
     class Config:
         from_attributes = True
+        frozen = True
 
 class OrderBase(BaseModel):
     """Base order schema"""
@@ -55,14 +50,12 @@ class OrderCreate(OrderBase):
     
     @validator('items')
     def validate_items(cls, v):
-        """Validate order items"""
-        if len(v) == 0:
-            raise ValueError('Order must have at least one item')
-        
-        # Check for duplicate menu items
-        menu_item_ids = [item.menu_item_id for item in v]
-        if len(set(menu_item_ids)) != len(menu_item_ids):
-            raise ValueError('Duplicate menu items in order')
+        """Reject duplicate menu items; min_items already rules out an empty list"""
+        seen = set()
+        for item in v:
+            if item.menu_item_id in seen:
+                raise ValueError('Duplicate menu items in order')
+            seen.add(item.menu_item_id)
         
         return v
 
@@ -72,7 +65,7 @@ class OrderUpdate(BaseModel):
     assigned_to: Optional[int] = None
     special_instructions: Optional[str] = None
 
-class OrderResponse(OrderBase):
+class OrderResponse(CachedJsonSchema, OrderBase):
     """Schema for order response"""
     id: int
     customer_id: int
@@ -92,3 +85,8 @@ class OrderResponse(OrderBase):
     
     class Config:
         from_attributes = True
+        frozen = True
+
+# Built once at import; validate ORM rows then dump_json the result
+OrderListAdapter = TypeAdapter(List[OrderResponse])
+OrderItemListAdapter = TypeAdapter(List[OrderItemResponse])
@@ -33,3 +33,14 @@ class ServiceResponse(ServiceBase):
     
     class Config:
         from_attributes = True
+        frozen = True
+
+class ServiceSummaryResponse(ServiceBase):
+    """Schema for a service in the listing (the columns it selects)"""
+    id: int
+    image_url: Optional[str]
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+        frozen = True
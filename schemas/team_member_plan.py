@@ -6,19 +6,23 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
+from schemas.base import CachedJsonSchema
+
 class TeamMemberPlanBase(BaseModel):
     """Base team member plan schema"""
     description: str = Field(..., min_length=1)
     
     class Config:
         from_attributes = True
+        # Never validated on its own; subclasses build on first use
+        defer_build = True
 
 class TeamMemberPlanCreate(TeamMemberPlanBase):
     """Schema for creating a team member plan"""
     team_member_ids: List[int] = Field(..., min_items=1)
     image_url: Optional[str] = None
 
-class TeamMemberPlanResponse(TeamMemberPlanBase):
+class TeamMemberPlanResponse(CachedJsonSchema, TeamMemberPlanBase):
     """Schema for team member plan response"""
     id: int
     admin_id: int
@@ -29,3 +33,4 @@ class TeamMemberPlanResponse(TeamMemberPlanBase):
     
     class Config:
         from_attributes = True
+        frozen = True
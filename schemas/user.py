@@ -2,35 +2,42 @@
 Pydantic schemas for User model
 """
 
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, Field, StringConstraints, validator
+from typing import Annotated, List, Optional
 from datetime import datetime
 import re
-from enum import Enum
 
-class UserRole(str, Enum):
-    """User role enumeration for schemas"""
-    CUSTOMER = "customer"
-    TEAM_MEMBER = "team_member"
-    ADMIN = "admin"
+from schemas.enums import UserRole
+from schemas.user_session import UserSessionResponse
+
+# Input formats: pydantic-core lowercases/strips, then one precompiled match
+# raises the readable message the register form shows. The register form
+# already strips non-digits from phone numbers client side
+_EMAIL_MATCH = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}').fullmatch
+_PHONE_MATCH = re.compile(r'[6-9]\d{9}').fullmatch
+
+def _check_email(v: str) -> str:
+    if not _EMAIL_MATCH(v):
+        raise ValueError('value is not a valid email address')
+    return v
+
+def _check_phone(v: str) -> str:
+    if not _PHONE_MATCH(v):
+        raise ValueError('Invalid Indian mobile number')
+    return v
+
+Email = Annotated[str, StringConstraints(to_lower=True), AfterValidator(_check_email)]
+Phone = Annotated[str, StringConstraints(strip_whitespace=True), AfterValidator(_check_phone)]
+
+# Password strength checks; [^\W\d_] is any letter, as str.isalpha
+_PW_HAS_DIGIT = re.compile(r'\d').search
+_PW_HAS_LETTER = re.compile(r'[^\W\d_]').search
 
 class UserBase(BaseModel):
     """Base user schema"""
     name: str = Field(..., min_length=2, max_length=100)
-    email: EmailStr
-    phone: str = Field(..., min_length=10, max_length=15)
-    
-    @validator('phone')
-    def validate_phone(cls, v):
-        """Validate phone number format"""
-        # Remove any non-digit characters
-        digits = re.sub(r'\D', '', v)
-        
-        # Check if it's a valid Indian mobile number
-        if len(digits) != 10 or not digits.startswith(('6', '7', '8', '9')):
-            raise ValueError('Invalid Indian mobile number')
-        
-        return digits
+    email: Email
+    phone: Phone
     
     class Config:
         from_attributes = True
@@ -46,9 +53,9 @@ class UserCreate(UserBase):
         """Validate password strength"""
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
-        if not any(char.isdigit() for char in v):
+        if not _PW_HAS_DIGIT(v):
             raise ValueError('Password must contain at least one digit')
-        if not any(char.isalpha() for char in v):
+        if not _PW_HAS_LETTER(v):
             raise ValueError('Password must contain at least one letter')
         return v
 
@@ -67,23 +74,16 @@ class AdminCreate(UserCreate):
 class UserUpdate(BaseModel):
     """Schema for updating a user"""
     name: Optional[str] = Field(None, min_length=2, max_length=100)
-    email: Optional[EmailStr] = None
-    phone: Optional[str] = Field(None, min_length=10, max_length=15)
+    email: Optional[Email] = None
+    phone: Optional[Phone] = None
     address: Optional[str] = None
     password: Optional[str] = Field(None, min_length=8, max_length=50)
-    
-    @validator('phone')
-    def validate_phone(cls, v):
-        """Validate phone number if provided"""
-        if v is not None:
-            digits = re.sub(r'\D', '', v)
-            if len(digits) != 10 or not digits.startswith(('6', '7', '8', '9')):
-                raise ValueError('Invalid Indian mobile number')
-            return digits
-        return v
 
 class UserResponse(UserBase):
     """Schema for user response"""
+    # Stored values are returned as-is; the input formats above apply to writes
+    email: Optional[str]
+    phone: Optional[str]
     id: int
     role: UserRole
     address: Optional[str]
@@ -94,3 +94,8 @@ class UserResponse(UserBase):
     
     class Config:
         from_attributes = True
+        frozen = True
+
+class UserWithSessions(UserResponse):
+    """Schema for a user together with their login sessions"""
+    sessions: List[UserSessionResponse] = Field(default_factory=list)
@@ -2,10 +2,12 @@
 Pydantic schemas for UserSession model
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, TypeAdapter, computed_field
+from typing import List, Optional
 from datetime import datetime
 
+from schemas.base import CachedJsonSchema
+
 class UserSessionBase(BaseModel):
     """Base user session schema"""
     pass
@@ -22,15 +24,36 @@ class UserSessionUpdate(BaseModel):
     """Schema for updating a user session"""
     logout_time: datetime
 
-class UserSessionResponse(UserSessionBase):
+class UserSessionResponse(CachedJsonSchema, UserSessionBase):
     """Schema for user session response"""
     id: int
     user_id: int
     login_time: datetime
     logout_time: Optional[datetime]
     date: datetime
-    duration_minutes: Optional[float]
     created_at: datetime
     
+    @computed_field
+    @property
+    def duration_minutes(self) -> Optional[float]:
+        """Session length in minutes, None while still logged in"""
+        if self.logout_time and self.login_time:
+            return round((self.logout_time - self.login_time).total_seconds() / 60, 2)
+        return None
+    
     class Config:
         from_attributes = True
+        frozen = True
+
+UserSessionListAdapter = TypeAdapter(List[UserSessionResponse])
+
+class UserOnlineStats(BaseModel):
+    """Schema for per-user online time statistics"""
+    user_id: int
+    user_name: str
+    role: str
+    total_sessions: int
+    total_minutes: float
+    avg_session_minutes: float
+    last_login: Optional[datetime]
+    last_logout: Optional[datetime]
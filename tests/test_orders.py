@@ -4,53 +4,86 @@ Order management tests
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import status
-from datetime import datetime
-import pytz
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 
-from models.user import User, UserRole
-from models.service import Service
-from models.menu_item import MenuItem
-from models.order import Order, OrderStatus
-from models.order_item import OrderItem
+from models import User, Service, MenuItem, Order, OrderItem
+from schemas.enums import UserRole, OrderStatus
 from core.security import get_password_hash
 
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo("Asia/Kolkata")
 
-@pytest.fixture
-async def test_customer(db: AsyncSession):
-    """Create test customer"""
-    customer = User(
-        name="Test Customer",
-        username="ordercustomer",
-        email="order@example.com",
-        phone="9876543201",
-        hashed_password=get_password_hash("Test@12345"),
-        role=UserRole.CUSTOMER,
-        is_active=True,
-        address="Test Address"
-    )
-    db.add(customer)
-    await db.commit()
-    await db.refresh(customer)
-    return customer
+_CUSTOMER_LOGIN = {"username": "ordercustomer", "password": "Test@12345"}
+_TEAM_LOGIN = {"username": "orderteam", "password": "Test@12345", "role": "team_member"}
+
+@pytest.fixture(scope="module")
+async def order_users(engine):
+    """Create the module's users in one batch, outside the per-test transaction"""
+    users = {
+        "customer": User(
+            name="Test Customer",
+            username="ordercustomer",
+            email="order@example.com",
+            phone="9876543201",
+            hashed_password=get_password_hash("Test@12345"),
+            role=UserRole.CUSTOMER,
+            is_active=True,
+            address="Test Address"
+        ),
+        "team_member": User(
+            name="Test Team Member",
+            username="orderteam",
+            email="orderteam@example.com",
+            phone="9876543202",
+            hashed_password=get_password_hash("Test@12345"),
+            role=UserRole.TEAM_MEMBER,
+            is_active=True
+        ),
+    }
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add_all(users.values())
+        await session.commit()
+        yield users
+        for user in users.values():
+            await session.delete(user)
+        await session.commit()
+
+@pytest.fixture(scope="module")
+def test_customer(order_users: dict) -> User:
+    return order_users["customer"]
+
+@pytest.fixture(scope="module")
+def test_team_member(order_users: dict) -> User:
+    return order_users["team_member"]
+
+@pytest.fixture(scope="module")
+async def customer_cookies(test_customer: User, login_cookies):
+    """Log the customer in once per module and keep the session cookies"""
+    return await login_cookies(_CUSTOMER_LOGIN)
+
+@pytest.fixture(scope="module")
+async def team_cookies(test_team_member: User, login_cookies):
+    """Log the team member in once per module and keep the session cookies"""
+    return await login_cookies(_TEAM_LOGIN)
 
 @pytest.fixture
-async def test_service(db: AsyncSession):
-    """Create test service"""
-    service = Service(
-        name="Test Service",
-        description="Test service description"
-    )
-    db.add(service)
-    await db.commit()
-    await db.refresh(service)
-    return service
+async def customer_client(client: AsyncClient, customer_cookies: dict):
+    """The test client, already logged in as the customer"""
+    client.cookies.update(customer_cookies)
+    return client
 
 @pytest.fixture
-async def test_menu_items(db: AsyncSession, test_service: Service):
-    """Create test menu items"""
+async def team_client(client: AsyncClient, team_cookies: dict):
+    """The test client, already logged in as the team member"""
+    client.cookies.update(team_cookies)
+    return client
+
+@pytest.fixture(scope="module")
+async def test_menu_items(engine, test_service: Service):
+    """Create test menu items once per module, outside the per-test transaction"""
     items = [
         MenuItem(
             service_id=test_service.id,
@@ -67,107 +100,77 @@ async def test_menu_items(db: AsyncSession, test_service: Service):
             is_available=True
         )
     ]
-    for item in items:
-        db.add(item)
-    await db.commit()
-    for item in items:
-        await db.refresh(item)
-    return items
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add_all(items)
+        await session.commit()
+        yield items
+        for item in items:
+            await session.delete(item)
+        await session.commit()
 
 @pytest.fixture
 async def test_order(db: AsyncSession, test_customer: User, test_service: Service, test_menu_items: list):
     """Create test order"""
+    # Items ride the order_items relationship, so one flush inserts everything
     order = Order(
         customer_id=test_customer.id,
         service_id=test_service.id,
         total_amount=250.00,
         address="Test Delivery Address",
         status=OrderStatus.PENDING,
-        created_at=datetime.now(IST)
+        created_at=datetime.now(IST),
+        order_items=[
+            OrderItem(
+                menu_item_id=test_menu_items[0].id,
+                quantity=1,
+                unit_price=100.00,
+                item_name=test_menu_items[0].name
+            ),
+            OrderItem(
+                menu_item_id=test_menu_items[1].id,
+                quantity=1,
+                unit_price=150.00,
+                item_name=test_menu_items[1].name
+            )
+        ]
     )
     db.add(order)
-    await db.commit()
-    await db.refresh(order)
-    
-    # Create order items
-    order_items = [
-        OrderItem(
-            order_id=order.id,
-            menu_item_id=test_menu_items[0].id,
-            quantity=1,
-            unit_price=100.00,
-            item_name=test_menu_items[0].name
-        ),
-        OrderItem(
-            order_id=order.id,
-            menu_item_id=test_menu_items[1].id,
-            quantity=1,
-            unit_price=150.00,
-            item_name=test_menu_items[1].name
-        )
-    ]
-    for item in order_items:
-        db.add(item)
-    await db.commit()
+    await db.flush()  # assigns ids; rolled back with the test
     
     return order
 
 @pytest.mark.asyncio
-async def test_view_services(client: AsyncClient, test_service: Service):
-    """Test viewing services"""
-    response = await client.get("/customer/services")
-    assert response.status_code in [status.HTTP_200_OK, status.HTTP_303_SEE_OTHER]
-    
-    # If redirected to login, that's okay for this test
-    if response.status_code == status.HTTP_200_OK:
-        assert "Services" in response.text
-
-@pytest.mark.asyncio
-async def test_service_menu(client: AsyncClient, test_service: Service):
-    """Test viewing service menu"""
-    response = await client.get(f"/customer/service/{test_service.id}")
-    assert response.status_code in [status.HTTP_200_OK, status.HTTP_303_SEE_OTHER]
-    
-    if response.status_code == status.HTTP_200_OK:
-        assert test_service.name in response.text
+@pytest.mark.parametrize("url,expect", [
+    pytest.param("/customer/services", "Services", id="services"),
+    pytest.param("/customer/service/{service_id}", "Test Service", id="service-menu"),
+    pytest.param("/customer/cart", "Cart", id="cart"),
+    pytest.param("/customer/orders", "Orders", id="orders"),
+    pytest.param("/customer/order/{order_id}", "Order #{order_id}", id="order-details"),
+])
+async def test_customer_pages(customer_client: AsyncClient, test_service: Service, test_order: Order,
+                              url: str, expect: str):
+    """Test customer pages render; ids are filled in from the fixtures"""
+    ids = {"service_id": test_service.id, "order_id": test_order.id}
+    response = await customer_client.get(url.format(**ids))
+    assert response.status_code == status.HTTP_200_OK
+    assert expect.format(**ids).encode() in response.content
 
 @pytest.mark.asyncio
-async def test_add_to_cart(client: AsyncClient, test_menu_items: list):
+async def test_add_to_cart(customer_client: AsyncClient, test_menu_items: list):
     """Test adding item to cart"""
-    # First login as customer
-    login_data = {
-        "username": "ordercustomer",
-        "password": "Test@12345"
-    }
-    await client.post("/auth/login", data=login_data)
-    
     # Add item to cart
     cart_data = {
         "menu_item_id": test_menu_items[0].id,
         "quantity": 2
     }
     
-    response = await client.post("/customer/cart/add", data=cart_data)
+    response = await customer_client.post("/customer/cart/add", data=cart_data)
     assert response.status_code == status.HTTP_200_OK
-    assert "Added" in response.text
+    assert b"Added" in response.content
 
 @pytest.mark.asyncio
-async def test_view_cart(client: AsyncClient):
-    """Test viewing cart"""
-    response = await client.get("/customer/cart")
-    assert response.status_code == status.HTTP_200_OK
-    assert "Cart" in response.text
-
-@pytest.mark.asyncio
-async def test_place_order(client: AsyncClient, test_customer: User, test_service: Service):
+async def test_place_order(customer_client: AsyncClient, test_customer: User, test_service: Service):
     """Test placing order"""
-    # Login as customer
-    login_data = {
-        "username": "ordercustomer",
-        "password": "Test@12345"
-    }
-    await client.post("/auth/login", data=login_data)
-    
     # Place order
     order_data = {
         "service_id": test_service.id,
@@ -175,114 +178,66 @@ async def test_place_order(client: AsyncClient, test_customer: User, test_servic
         "items": '[{"menu_item_id": 1, "quantity": 2}]'
     }
     
-    response = await client.post("/customer/order/place", data=order_data)
+    response = await customer_client.post("/customer/order/place", data=order_data)
     assert response.status_code in [status.HTTP_200_OK, status.HTTP_303_SEE_OTHER]
     
     if response.status_code == status.HTTP_303_SEE_OTHER:
         assert "orders" in response.headers.get("location", "")
 
 @pytest.mark.asyncio
-async def test_view_orders(client: AsyncClient, test_order: Order):
-    """Test viewing customer orders"""
-    response = await client.get("/customer/orders")
-    assert response.status_code == status.HTTP_200_OK
-    assert "Orders" in response.text
-
-@pytest.mark.asyncio
-async def test_order_details(client: AsyncClient, test_order: Order):
-    """Test viewing order details"""
-    response = await client.get(f"/customer/order/{test_order.id}")
-    assert response.status_code == status.HTTP_200_OK
-    assert f"Order #{test_order.id}" in response.text
-
-@pytest.mark.asyncio
-async def test_update_order_status(client: AsyncClient, test_order: Order, db: AsyncSession):
+async def test_update_order_status(team_client: AsyncClient, test_order: Order, db: AsyncSession):
     """Test updating order status (admin/team member function)"""
-    # Create team member for testing
-    team_member = User(
-        name="Test Team Member",
-        username="orderteam",
-        email="orderteam@example.com",
-        phone="9876543202",
-        hashed_password=get_password_hash("Test@12345"),
-        role=UserRole.TEAM_MEMBER,
-        is_active=True
-    )
-    db.add(team_member)
-    await db.commit()
-    
-    # Login as team member
-    login_data = {
-        "username": "orderteam",
-        "password": "Test@12345",
-        "role": "team_member"
-    }
-    await client.post("/auth/login", data=login_data)
-    
     # Update order status
     update_data = {
         "status": "confirmed"
     }
     
-    response = await client.post(f"/team/order/{test_order.id}/status", data=update_data)
+    response = await team_client.post(f"/team/order/{test_order.id}/status", data=update_data)
     assert response.status_code == status.HTTP_200_OK
     
     # Verify status updated in database
-    await db.refresh(test_order)
-    assert test_order.status == OrderStatus.CONFIRMED
+    order_status = await db.scalar(select(Order.status).where(Order.id == test_order.id))
+    assert order_status == OrderStatus.CONFIRMED
 
 @pytest.mark.asyncio
-async def test_generate_otp(client: AsyncClient, test_order: Order, db: AsyncSession):
+async def test_generate_otp(team_client: AsyncClient, test_order: Order, db: AsyncSession):
     """Test OTP generation for delivery"""
     # Set order status to out_for_delivery
     test_order.status = OrderStatus.OUT_FOR_DELIVERY
     await db.commit()
     
-    # Login as team member
-    login_data = {
-        "username": "orderteam",
-        "password": "Test@12345",
-        "role": "team_member"
-    }
-    await client.post("/auth/login", data=login_data)
-    
     # Generate OTP
-    response = await client.post(f"/team/order/{test_order.id}/generate-otp")
+    response = await team_client.post(f"/team/order/{test_order.id}/generate-otp")
     assert response.status_code == status.HTTP_200_OK
-    assert "OTP" in response.text
+    assert b"OTP" in response.content
     
     # Verify OTP stored in database
-    await db.refresh(test_order)
-    assert test_order.otp is not None
-    assert test_order.otp_expiry is not None
+    otp, otp_expiry = (await db.execute(
+        select(Order.otp, Order.otp_expiry).where(Order.id == test_order.id)
+    )).one()
+    assert otp is not None
+    assert otp_expiry is not None
 
 @pytest.mark.asyncio
-async def test_verify_otp(client: AsyncClient, test_order: Order, db: AsyncSession):
+async def test_verify_otp(team_client: AsyncClient, test_order: Order, db: AsyncSession):
     """Test OTP verification"""
-    # Set OTP for testing
+    # Set up an out-for-delivery order with a live OTP
+    test_order.status = OrderStatus.OUT_FOR_DELIVERY
     test_order.otp = "1234"
-    test_order.otp_expiry = datetime.now(IST).replace(tzinfo=IST)
+    test_order.otp_expiry = datetime.now(IST) + timedelta(minutes=5)
     await db.commit()
     
-    # Login as team member
-    login_data = {
-        "username": "orderteam",
-        "password": "Test@12345",
-        "role": "team_member"
-    }
-    await client.post("/auth/login", data=login_data)
-    
     # Verify OTP
     otp_data = {
         "otp": "1234"
     }
     
-    response = await client.post(f"/team/order/{test_order.id}/verify-otp", data=otp_data)
+    response = await team_client.post(f"/team/order/{test_order.id}/verify-otp", data=otp_data)
     assert response.status_code == status.HTTP_200_OK
     
     # Verify order marked as delivered
-    await db.refresh(test_order)
-    assert test_order.status == OrderStatus.DELIVERED
+    order_status = await db.scalar(select(Order.status).where(Order.id == test_order.id))
+    assert order_status == OrderStatus.DELIVERED
 
 @pytest.mark.asyncio
 async def test_order_statistics(client: AsyncClient, db: AsyncSession):
@@ -306,31 +261,17 @@ async def test_recent_orders_api(client: AsyncClient):
     assert isinstance(data, list)
 
 @pytest.mark.asyncio
-async def test_cancel_order(client: AsyncClient, test_order: Order):
+async def test_cancel_order(customer_client: AsyncClient, test_order: Order):
     """Test order cancellation"""
-    # Login as customer
-    login_data = {
-        "username": "ordercustomer",
-        "password": "Test@12345"
-    }
-    await client.post("/auth/login", data=login_data)
-    
     # Cancel order
-    response = await client.post(f"/customer/order/{test_order.id}/cancel")
+    response = await customer_client.post(f"/customer/order/{test_order.id}/cancel")
     assert response.status_code in [status.HTTP_200_OK, status.HTTP_303_SEE_OTHER]
     
     # Note: Cancel endpoint needs to be implemented in routes
 
 @pytest.mark.asyncio
-async def test_order_with_invalid_items(client: AsyncClient, test_service: Service):
+async def test_order_with_invalid_items(customer_client: AsyncClient, test_service: Service):
     """Test order placement with invalid items"""
-    # Login as customer
-    login_data = {
-        "username": "ordercustomer",
-        "password": "Test@12345"
-    }
-    await client.post("/auth/login", data=login_data)
-    
     # Try to place order with invalid item
     order_data = {
         "service_id": test_service.id,
@@ -338,6 +279,6 @@ async def test_order_with_invalid_items(client: AsyncClient, test_service: Servi
         "items": '[{"menu_item_id": 99999, "quantity": 1}]'  # Non-existent item
     }
     
-    response = await client.post("/customer/order/place", data=order_data)
+    response = await customer_client.post("/customer/order/place", data=order_data)
     assert response.status_code == status.HTTP_200_OK
-    assert "not found" in response.text.lower()
+    assert b"not found" in response.content.lower()